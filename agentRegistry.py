@@ -0,0 +1,101 @@
+# agentRegistry.py
+# ---------------
+# Contains the registry of the agents that can play a game, mapping
+# the name of each agent to its class and the typed options it accepts.
+# Game creates its agent through createAgent.
+
+from agents import *
+from qLearningAgents import QLearningAgent
+from nTupleAgents import NTupleAgent
+
+
+class AgentOption():
+	"""
+	A keyword argument accepted by an agent, with its type.
+	"""
+
+	def __init__(self, name, type):
+		self.name = name
+		self.type = type
+
+	def check(self, value):
+		"""
+		Return value as the type of the option, raising a TypeError if
+		it has another type. None stands for the default of the agent.
+		"""
+		if value is None or isinstance(value, self.type):
+			return value
+		# Integers are accepted for floats, but not booleans for numbers
+		if self.type is float and isinstance(value, int) and not isinstance(value, bool):
+			return float(value)
+		raise TypeError("Option {} must be of type {}, not {}.".format(
+			self.name, self.type.__name__, type(value).__name__))
+
+
+class AgentEntry():
+	"""
+	An agent of the registry: its class, whether it searches to a
+	given depth and the options it accepts.
+	"""
+
+	def __init__(self, agentClass, options=(), takesDepth=False):
+		self.name = agentClass.__name__
+		self.agentClass = agentClass
+		self.options = dict((option.name, option) for option in options)
+		self.takesDepth = takesDepth
+
+	def create(self, depth=None, **options):
+		"""
+		Return a new agent, searching to depth if the agent takes a depth.
+		Unknown options raise a ValueError and options of the wrong type
+		a TypeError. Options set to None keep the default of the agent.
+		"""
+		unknown = [name for name in options if name not in self.options]
+		if unknown:
+			raise ValueError("Unknown options of {}: {}. Options: {}".format(
+				self.name, ", ".join(unknown), ", ".join(self.options)))
+		kwargs = {}
+		for name, value in options.items():
+			value = self.options[name].check(value)
+			if value is not None:
+				kwargs[name] = value
+		if self.takesDepth and depth is not None:
+			kwargs["depth"] = depth
+		return self.agentClass(**kwargs)
+
+
+# Options shared by all Expectimax agents, see ExpectimaxAgent.__init__
+EXPECTIMAX_OPTIONS = [AgentOption("ttSize", int), AgentOption("persistTT", bool),
+					  AgentOption("probCutoff", float), AgentOption("timePerMove", float),
+					  AgentOption("workers", int), AgentOption("batchLeaves", bool),
+					  AgentOption("evalCacheSize", int), AgentOption("canonicalKeys", bool),
+					  AgentOption("profileEval", bool)]
+
+# The agents by name, in the order in which they are listed to users
+AGENTS = {}
+
+def registerAgent(entry):
+	"""
+	Add an AgentEntry to the registry, replacing any agent of the same name.
+	"""
+	AGENTS[entry.name] = entry
+
+def createAgent(name, depth=None, **options):
+	"""
+	Return a new agent of the registered name, see AgentEntry.create.
+	"""
+	if name not in AGENTS:
+		raise ValueError("Unknown agent: {}. Options: {}".format(name, ", ".join(AGENTS)))
+	return AGENTS[name].create(depth, **options)
+
+
+registerAgent(AgentEntry(RandomAgent))
+for agentClass in (MaxScoreExpectimaxAgent, MaxTileExpectimaxAgent, NumEmptyExpectimaxAgent,
+				   MaxTileCornerExpectimaxAgent, TileDiffExpectimaxAgent, FullMaxRowExpectimaxAgent,
+				   AscendingRowsExpectimaxAgent, WeightedExpectimaxAgent, MonotonicSnakeExpectimaxAgent):
+	registerAgent(AgentEntry(agentClass, EXPECTIMAX_OPTIONS, takesDepth=True))
+registerAgent(AgentEntry(MonteCarloAgent, [AgentOption("rollouts", int), AgentOption("workers", int),
+										   AgentOption("chunkSize", int), AgentOption("batched", bool)]))
+registerAgent(AgentEntry(QLearningAgent, [AgentOption("alpha", float), AgentOption("epsilon", float),
+										  AgentOption("gamma", float)]))
+registerAgent(AgentEntry(NTupleAgent, [AgentOption("weightsFile", str), AgentOption("alpha", float)]))
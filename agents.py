@@ -5,8 +5,12 @@
 
 import numpy as np
 import sys
+import time
 from multiprocessing import Pool
 from evaluators import Evaluator
+from caches import LRUCache
+from gameObjects import MOVE_CODES, transformMove, inverseTransformMove
+from batchBoard import BatchBoard
 
 class Agent():
 	"""
@@ -14,10 +18,15 @@ class Agent():
 	Note that this agent is supposed to be to be subclassed.
 	"""
 
-	def __init__(self, depth=2):
-		"""Initialize an agent"""
+	def __init__(self, depth=2, rng=None):
+		"""
+		Initialize an agent.
+		rng = np.random.Generator for the random choices of the agent
+			(a new unseeded one by default)
+		"""
 		self.scores = []
 		self.maxTiles = []
+		self.rng = rng if rng is not None else np.random.default_rng()
 
 	def move(self, board):
 		"""
@@ -39,6 +48,27 @@ class Agent():
 		"""
 		self.maxTiles.append(tile)
 
+	def cacheStats(self):
+		"""
+		Return a dictionary mapping the name of each cache used by the
+		agent to the counters of that cache.
+		"""
+		return {}
+
+	def decisionStats(self):
+		"""
+		Return a dictionary of counters describing the work done for the
+		last move, written to the AgentHeur column of the log.
+		"""
+		return {}
+
+	def close(self):
+		"""
+		Release the resources held by the agent, such as worker processes.
+		Called when a game is finished.
+		"""
+		pass
+
 
 class RandomAgent(Agent):
 	"""
@@ -47,7 +77,8 @@ class RandomAgent(Agent):
 
 	def move(self, board):
 		"""Return a any of the valid moves with equal probability"""
-		return np.random.choice(board.validMoves())
+		moves = board.validMoves()
+		return moves[self.rng.integers(len(moves))]
 
 class MonteCarloAgent(Agent):
 	"""
@@ -55,18 +86,49 @@ class MonteCarloAgent(Agent):
 	200 random rollouts.
 	"""
 
-	def __init__(self, rollouts=200):
+	def __init__(self, rollouts=200, workers=4, chunkSize=None, batched=False, rng=None):
+		"""
+		Initialize a Monte Carlo agent.
+		rollouts = number of random games played per candidate move
+		workers = number of worker processes playing the rollouts,
+			1 plays them in this process
+		chunkSize = number of rollouts played by a worker per task,
+			by default the rollouts of a move are split evenly over the workers
+		batched = play all rollouts of a move together as NumPy arrays in
+			this process instead of using workers, on boards of size 4 with
+			tiles below 32768 (BatchBoard packs each tile into 4 bits)
+		rng = np.random.Generator playing the rollouts (see Agent)
+		"""
 		self.rollouts = rollouts
-		super().__init__()
+		self.workers = workers
+		self.batched = batched
+		if chunkSize is None:
+			chunkSize = int(np.ceil(rollouts * 1. / max(workers, 1)))
+		self.chunkSize = chunkSize
+
+		# Worker processes, started on the first move and kept until
+		# close is called
+		self.pool = None
+
+		# Number of moves played in the rollouts of the last decision
+		self.rolloutMoves = 0
+		self.numCandidates = 0
+		super().__init__(rng=rng)
 
 	def move(self, board):
 		"""Return a any of the valid moves with equal probability"""
 
+		moves = board.validMoves()
+		self.numCandidates = len(moves)
+		self.rolloutMoves = 0
+		if self.batched and board.size == 4 and board.maxTile() < 32768:
+			scores = [self.batchRollout(move, board) for move in moves]
+		else:
+			scores = self.multiProcessingRollout(moves, board)
+
 		bestScore = board.score
 		bestMove = None
-		for move in board.validMoves():
-			# print("Trying out {}".format(move))
-			score = self.multiProcessingRollout(move, board)
+		for move, score in zip(moves, scores):
 			if score > bestScore:
 				bestScore = score
 				bestMove = move
@@ -75,32 +137,106 @@ class MonteCarloAgent(Agent):
 
 	def rollout(self, move, board):
 		"""Return the average score of a randomly played game after making one specific move
-		(self.rollouts)."""
-		scores = []
-		for _ in range(self.rollouts):
-			postMoveBoard = board.getSuccessor(move, printOpts=False)
-			while len(postMoveBoard.validMoves()) > 0:
-				postMoveBoard = postMoveBoard.getSuccessor(np.random.choice(postMoveBoard.validMoves()), printOpts=False)
-			scores.append(postMoveBoard.score)
+		(self.rollouts), playing the same games as multiProcessingRollout."""
+		return self.multiProcessingRollout([move], board)[0]
 
-		return np.mean(scores)
-
-	def multiProcessingRollout(self, move, board):
+	def batchRollout(self, move, board):
 		"""Return the average score of a randomly played game after making one specific move
-		(self.rollouts). Note: this function distributes rollouts onto different cores."""
-
-		scores = []
-		pool = Pool(processes=4)
-		scores = pool.map(simulateMC, [(board, move) for _ in range(self.rollouts)])
-		pool.close()
-		return np.mean(scores)
+		(self.rollouts). Note: this function plays all rollouts at once on a BatchBoard,
+		dropping games from the batch as they end."""
+
+		games = BatchBoard.repeat(board, self.rollouts, rng=self.rng)
+		games.step(MOVE_CODES[move])
+		self.rolloutMoves += games.n
+
+		total = 0
+		while games.n > 0:
+			mask = games.validMoveMask()
+			alive = mask.any(axis=1)
+			if not alive.all():
+				total += games.scores[~alive].sum()
+				games = BatchBoard(exps=games.exps[alive], scores=games.scores[alive], rng=self.rng)
+				mask = mask[alive]
+				if games.n == 0:
+					break
+			games.step(games.randomValidMoves(mask))
+			self.rolloutMoves += games.n
+
+		return total * 1. / self.rollouts
+
+	def multiProcessingRollout(self, moves, board):
+		"""Return, for each of the moves, the average score of a randomly played game after
+		making that move (self.rollouts). Note: this function distributes rollouts onto
+		different cores, in chunks of self.chunkSize rollouts per task, or plays them in
+		this process with a single worker. Every rollout plays with its own generator
+		spawned from self.rng, so the result does not depend on the number of workers
+		or the chunk size."""
+
+		tasks = []
+		for k in range(len(moves)):
+			rngs = self.rng.spawn(self.rollouts)
+			for start in range(0, self.rollouts, self.chunkSize):
+				tasks.append((board, moves[k], rngs[start:start + self.chunkSize], k))
+
+		if self.workers > 1:
+			if self.pool is None:
+				self.pool = Pool(processes=self.workers)
+			results = self.pool.map(simulateMCChunk, tasks, chunksize=1)
+		else:
+			results = [simulateMCChunk(task) for task in tasks]
+
+		totals = np.zeros(len(moves))
+		for k, (total, numMoves) in zip([task[3] for task in tasks], results):
+			totals[k] += total
+			self.rolloutMoves += numMoves
+		return totals / self.rollouts
+
+	def decisionStats(self):
+		return {"candidates": self.numCandidates,
+				"rollouts": self.numCandidates * self.rollouts,
+				"rolloutMoves": self.rolloutMoves}
+
+	def close(self):
+		if self.pool is not None:
+			self.pool.close()
+			self.pool.join()
+			self.pool = None
+
+	def __getstate__(self):
+		state = self.__dict__.copy()
+		state["pool"] = None
+		return state
+
+def simulateMCChunk(args):
+	"""
+	Play a chunk of rollouts after making one move, one with each of the
+	generators, and return the sum of their final scores and the number
+	of moves played.
+	"""
+	b, move, rngs, _ = args
+	results = [simulateMC((b, move, rng)) for rng in rngs]
+	return sum(score for score, _ in results), sum(numMoves for _, numMoves in results)
 
 def simulateMC(args):
-	b, move = args
-	postMoveBoard = b.getSuccessor(move, printOpts=False)
-	while len(postMoveBoard.validMoves()) > 0:
-		postMoveBoard = postMoveBoard.getSuccessor(np.random.choice(postMoveBoard.validMoves()), printOpts=False)
-	return postMoveBoard.score
+	"""
+	Play a random game after making move and return its final score and
+	the number of moves played.
+	"""
+	b, move, rng = args
+	# Play the whole rollout on a single copy of the board, drawing its
+	# tiles from rng rather than from the generator of the game
+	postMoveBoard = b.copy()
+	postMoveBoard.rng = rng
+	postMoveBoard.shift(move)
+	postMoveBoard.placeRandomTile(1)
+	numMoves = 1
+	moves = postMoveBoard.validMoves()
+	while len(moves) > 0:
+		postMoveBoard.shift(moves[rng.integers(len(moves))])
+		postMoveBoard.placeRandomTile(1)
+		numMoves += 1
+		moves = postMoveBoard.validMoves()
+	return postMoveBoard.score, numMoves
 
 
 class ExpectimaxAgent(Agent):
@@ -109,57 +245,414 @@ class ExpectimaxAgent(Agent):
 	heuristic function.
 	"""
 
-	def __init__(self, weights, depth):
+	def __init__(self, weights, depth, ttSize=None, persistTT=False, probCutoff=0.,
+				 timePerMove=None, workers=None, batchLeaves=False, evalCacheSize=None,
+				 canonicalKeys=False, profileEval=False):
 		"""
 		Initialize an expectimax agent.
+		ttSize = maximum number of positions in the transposition table
+			(None disables it)
+		persistTT = keep the transposition table between consecutive moves
+		probCutoff = positions reached with a lower cumulative probability
+			of their random tiles are evaluated instead of searched further
+		timePerMove = if given, search depth 1, 2, ... up to depth and
+			return the move of the deepest search finished within this
+			many seconds
+		workers = if larger than 1, search the root moves in parallel on
+			a pool of this many processes, which is kept for the whole game
+		batchLeaves = evaluate all leaves below a max node of the last
+			search level at once with Evaluator.evaluateBatch (size 4
+			boards with tiles below 32768 only)
+		evalCacheSize = maximum number of leaf values kept in the evaluation
+			cache for the whole game (None disables it)
+		canonicalKeys = store one entry per class of rotated and reflected
+			boards in the caches, if all weighted features are invariant
+			under these symmetries (see Evaluator.symmetricFeatures)
+		profileEval = report the time spent on each evaluation feature in
+			decisionStats, at the cost of timing every leaf
 		"""
 		self.weights = weights
+		self.evaluator = Evaluator.compile(weights)
+		self.batchLeaves = batchLeaves
+		self.profileEval = profileEval
+
+		# Values of evaluated positions, keyed by the identity of the
+		# weights and the board state
+		self.weightsId = hash(frozenset(weights.items()))
+		self.symmetric = canonicalKeys and Evaluator.isSymmetric(weights)
+		if evalCacheSize:
+			self.evalCache = LRUCache(evalCacheSize)
+		else:
+			self.evalCache = None
 		self.maxDepth = depth
+		self.probCutoff = probCutoff
+
+		# Anytime search state: the time at which the current search
+		# has to stop, whether it was interrupted, and the depth that
+		# was completed for each decision
+		self.timePerMove = timePerMove
+		self.deadline = None
+		self.timedOut = False
+		self.depthReached = None
+		self.depthsReached = []
+
+		# Worker processes for searching the root moves in parallel,
+		# started on the first move and kept until close is called
+		self.workers = workers
+		self.pool = None
+
+		# Values of positions that were already searched, keyed by the
+		# board state and the remaining search depth
+		if ttSize:
+			self.transpositionTable = LRUCache(ttSize)
+		else:
+			self.transpositionTable = None
+		self.persistTT = persistTT
+
+		# Work done for the current decision, see decisionStats
+		self.resetCounters()
 		super().__init__()
 
-	def valueFunction(self, state):
-		return Evaluator.evaluate(state, self.weights)
+	def resetCounters(self):
+		"""
+		Zero the counters of the search: expanded max nodes, chance nodes,
+		evaluated leaves and hits of the caches, and the evaluation times.
+		"""
+		self.counters = {"maxNodes": 0, "chanceNodes": 0, "leafEvals": 0,
+						 "ttHits": 0, "evalCacheHits": 0}
+		if self.profileEval:
+			self.evaluator.startProfiling()
+			self.batchEvalTime = 0.
+
+	def addCounters(self, counters):
+		"""
+		Add the counters of a search done elsewhere, such as in a worker.
+		"""
+		for name in self.counters:
+			self.counters[name] += counters[name]
+		if self.profileEval:
+			for feature, seconds in counters["featureTimes"].items():
+				self.evaluator.featureTimes[feature] += seconds
+			self.batchEvalTime += counters["batchEvalTime"]
+
+	def searchCounters(self):
+		"""
+		Return the counters of the search, in the form taken by addCounters.
+		"""
+		counters = dict(self.counters)
+		if self.profileEval:
+			counters["featureTimes"] = self.evaluator.featureTimes
+			counters["batchEvalTime"] = self.batchEvalTime
+		return counters
+
+	def decisionStats(self):
+		"""
+		Return the counters of the last decision and the depth it reached,
+		and with profileEval the milliseconds spent on each feature.
+		"""
+		stats = dict(self.counters)
+		stats["depth"] = self.depthReached
+		if self.profileEval:
+			for feature, seconds in self.evaluator.featureTimes.items():
+				stats["evalMs." + feature] = round(1000 * seconds, 3)
+			if self.batchLeaves:
+				stats["evalMs.batch"] = round(1000 * self.batchEvalTime, 3)
+		return stats
 
-	def findBestMove(self, state, depth):
+	def valueFunction(self, state):
+		if self.evalCache is None:
+			self.counters["leafEvals"] += 1
+			return self.evaluator(state)
+
+		if self.symmetric:
+			key = (self.weightsId, state.canonicalKey()[0])
+		else:
+			key = (self.weightsId, state.key())
+		value = self.evalCache.get(key)
+		if value is None:
+			self.counters["leafEvals"] += 1
+			value = self.evaluator(state)
+			self.evalCache.put(key, value)
+		else:
+			self.counters["evalCacheHits"] += 1
+		return value
+
+	def findBestMove(self, state, depth, prob=1.):
+		"""
+		Return the best move and its expected value, searching depth
+		moves ahead. prob is the probability of reaching state from the
+		root through the random tiles placed so far.
+		Note that transposition table entries are shared between paths
+		of different probability, so with a probCutoff the result can
+		depend on the search order.
+		"""
 		if depth == 0 or state.isGameOver():
 			return None, self.valueFunction(state)
 
-		moves = state.validMoves()
-		successorProbs = [state.getAllSuccessors(move) for move in moves]
+		if self.deadline is not None and time.time() > self.deadline:
+			# Abandon the search, the caller discards its result
+			self.timedOut = True
+			return None, 0
+
+		if self.transpositionTable is not None:
+			if self.symmetric:
+				# Moves are stored as seen on the canonical board
+				stateKey, transform = state.canonicalKey()
+			else:
+				stateKey, transform = state.key(), 0
+			key = (stateKey, depth)
+			entry = self.transpositionTable.get(key)
+			if entry is not None:
+				self.counters["ttHits"] += 1
+				return inverseTransformMove(entry[0], transform), entry[1]
+
+		self.counters["maxNodes"] += 1
+		if depth == 1 and self.canBatchLeaves(state):
+			# The leaves below all moves are evaluated in a single batch
+			bestMove, bestVal = self.bestLeafMove(state)
+		else:
+			bestMove = None
+			bestVal = -sys.maxsize
+			for move in state.validMoves():
+				expectedValue = self.expectedValue(state, move, depth, prob)
+				if expectedValue > bestVal:
+					bestVal = expectedValue
+					bestMove = move
+				if self.timedOut:
+					return None, 0
+
+		if self.transpositionTable is not None:
+			self.transpositionTable.put(key, (transformMove(bestMove, transform), bestVal))
+		return bestMove, bestVal
+
+	def expectedValue(self, state, move, depth, prob=1.):
+		"""
+		Return the expected value of making move in state, averaged over
+		all random tiles that can appear afterwards.
+		"""
+		self.counters["chanceNodes"] += 1
+		if depth == 1 and self.canBatchLeaves(state):
+			return self.expectedLeafValues(state, [move])[0]
+
+		# Only the current path of the search is held in memory, as the
+		# successors are generated in place one at a time
+		expectedValue = 0
+		successors = state.iterSuccessors(move)
+		for successor, tileProb in successors:
+			if prob * tileProb < self.probCutoff:
+				# Too unlikely to be worth searching further
+				value = self.valueFunction(successor)
+			else:
+				value = self.findBestMove(successor, depth - 1, prob * tileProb)[1]
+			expectedValue += value * tileProb
+			if self.timedOut:
+				break
+		# Restore the state if the search was abandoned
+		successors.close()
+		return expectedValue
+
+	def canBatchLeaves(self, state):
+		"""
+		Return True if the leaves below state can be evaluated with
+		Evaluator.evaluateBatch: boards of size 4 whose tiles stay below
+		65536 after one more move.
+		"""
+		return self.batchLeaves and state.size == 4 and state.maxTile() < 32768
 
+	def bestLeafMove(self, state):
+		"""
+		Return the best move and its expected value at a max node one
+		move above the leaves, evaluating the leaves of all moves together.
+		"""
+		moves = state.validMoves()
+		self.counters["chanceNodes"] += len(moves)
 		bestMove = None
 		bestVal = -sys.maxsize
+		for move, expectedValue in zip(moves, self.expectedLeafValues(state, moves)):
+			if expectedValue > bestVal:
+				bestVal = expectedValue
+				bestMove = move
+		return bestMove, bestVal
+
+	def expectedLeafValues(self, state, moves):
+		"""
+		Return the expected value of making each of the moves in state,
+		evaluating the leaves obtained by placing a 2 or a 4 on each empty
+		square after every move in a single call to Evaluator.evaluateBatch.
+		"""
+		leaves = []
+		probs = []
+		scores = []
+		starts = []
+		numLeaves = 0
+		for move in moves:
+			undo = state.makeMove(move)
+			emptyIndices = state.emptySquares()
+			prob2 = state.prob2 * 1. / len(emptyIndices)
+			prob4 = state.prob4 * 1. / len(emptyIndices)
+
+			# Every valid move leaves at least one empty square
+			numMoveLeaves = 2 * len(emptyIndices)
+			cells = [i * state.size + j for (i, j) in emptyIndices]
+			moveLeaves = np.repeat(np.array([state.exponents()], dtype=np.uint8), numMoveLeaves, axis=0)
+			moveLeaves[np.arange(0, numMoveLeaves, 2), cells] = 1
+			moveLeaves[np.arange(1, numMoveLeaves, 2), cells] = 2
+
+			leaves.append(moveLeaves)
+			probs.append(np.tile([prob2, prob4], len(emptyIndices)))
+			scores.append(np.full(numMoveLeaves, state.score))
+			starts.append(numLeaves)
+			numLeaves += numMoveLeaves
+			state.unmakeMove(undo)
+
+		self.counters["leafEvals"] += numLeaves
+		if self.profileEval:
+			beginTime = time.perf_counter()
+		values = Evaluator.evaluateBatch(np.concatenate(leaves), self.weights, np.concatenate(scores))
+		if self.profileEval:
+			self.batchEvalTime += time.perf_counter() - beginTime
+		return [float(value) for value in np.add.reduceat(values * np.concatenate(probs), starts)]
+
+	def searchRoot(self, state, depth):
+		"""
+		Return the best move and its expected value like findBestMove,
+		but search the root moves on the worker pool if there is one.
+		"""
+		if self.workers is None or self.workers <= 1 or depth == 0 or state.isGameOver():
+			return self.findBestMove(state, depth)
+
+		if self.pool is None:
+			# Every worker receives its own copy of the agent once
+			self.pool = Pool(processes=self.workers, initializer=initSearchWorker,
+							 initargs=(self,))
 
-		for i, (successors, probs) in enumerate(successorProbs):
+		moves = state.validMoves()
+		results = self.pool.map(searchRootMove,
+								[(state, move, depth, self.deadline) for move in moves])
+
+		# The root is expanded here, the rest of the tree in the workers
+		self.counters["maxNodes"] += 1
+		for (_, _, counters) in results:
+			self.addCounters(counters)
 
-			values = [self.findBestMove(successor, depth - 1)[1] * prob for
-						(successor, prob) in zip(successors, probs)]
-			expectedValue = np.sum(values)
+		bestMove = None
+		bestVal = -sys.maxsize
+		for move, (expectedValue, timedOut, _) in zip(moves, results):
+			if timedOut:
+				self.timedOut = True
+				return None, 0
 			if expectedValue > bestVal:
 				bestVal = expectedValue
-				bestMove = moves[i]
+				bestMove = move
 		return bestMove, bestVal
 
 	def move(self, state):
 		"""
 		Greedily choose the action that maximizes the heuristic.
 		"""
-		return self.findBestMove(state, self.maxDepth)[0]
+		if self.transpositionTable is not None and not self.persistTT:
+			self.transpositionTable.clear()
+		self.resetCounters()
+
+		if self.timePerMove is None:
+			self.depthReached = self.maxDepth
+			self.depthsReached.append(self.depthReached)
+			return self.searchRoot(state, self.maxDepth)[0]
+
+		return self.iterativeDeepening(state)
+
+	def iterativeDeepening(self, state):
+		"""
+		Search with increasing depth until the time per move runs out,
+		and return the best move of the deepest completed search.
+		"""
+		deadline = time.time() + self.timePerMove
+
+		# The depth 1 search always completes, so that there is a move
+		bestMove = self.searchRoot(state, 1)[0]
+		self.depthReached = 1
+
+		self.deadline = deadline
+		for depth in range(2, self.maxDepth + 1):
+			if time.time() >= deadline:
+				break
+			self.timedOut = False
+			move = self.searchRoot(state, depth)[0]
+			if self.timedOut:
+				break
+			bestMove = move
+			self.depthReached = depth
+
+		self.deadline = None
+		self.timedOut = False
+		self.depthsReached.append(self.depthReached)
+		return bestMove
+
+	def cacheStats(self):
+		stats = {}
+		if self.transpositionTable is not None:
+			stats["transpositionTable"] = self.transpositionTable.stats()
+		if self.evalCache is not None:
+			stats["evalCache"] = self.evalCache.stats()
+		return stats
+
+	def close(self):
+		if self.pool is not None:
+			self.pool.close()
+			self.pool.join()
+			self.pool = None
+
+	def __getstate__(self):
+		"""
+		Return the state sent to worker processes: the pool stays in
+		this process and every worker starts with empty caches of the
+		same sizes.
+		"""
+		state = self.__dict__.copy()
+		state["pool"] = None
+		if self.transpositionTable is not None:
+			state["transpositionTable"] = LRUCache(self.transpositionTable.maxSize)
+		if self.evalCache is not None:
+			state["evalCache"] = LRUCache(self.evalCache.maxSize)
+		return state
+
+
+# The copy of the ExpectimaxAgent used by a worker process
+searchAgent = None
+
+def initSearchWorker(agent):
+	global searchAgent
+	searchAgent = agent
+
+def searchRootMove(args):
+	"""
+	Return the expected value of one root move, whether the search
+	ran out of time and the counters of the search, using the agent of
+	this worker process.
+	"""
+	state, move, depth, deadline = args
+	if searchAgent.transpositionTable is not None and not searchAgent.persistTT:
+		searchAgent.transpositionTable.clear()
+	searchAgent.resetCounters()
+	searchAgent.deadline = deadline
+	searchAgent.timedOut = False
+	value = searchAgent.expectedValue(state, move, depth)
+	return value, searchAgent.timedOut, searchAgent.searchCounters()
 
 
 class MaxScoreExpectimaxAgent(ExpectimaxAgent):
 	"""
 	An expectimax agent trying to maximize the score.
 	"""
-	def __init__(self, depth):
-		super().__init__({"score": 1}, depth)
+	def __init__(self, depth, **kwargs):
+		super().__init__({"score": 1}, depth, **kwargs)
 
 class MaxTileExpectimaxAgent(ExpectimaxAgent):
 	"""
 	An expectimax agent trying to maximize the maximum tile.
 	"""
-	def __init__(self, depth):
-		super().__init__({"maxTile": 1}, depth)
+	def __init__(self, depth, **kwargs):
+		super().__init__({"maxTile": 1}, depth, **kwargs)
 
 
 class NumEmptyExpectimaxAgent(ExpectimaxAgent):
@@ -167,8 +660,8 @@ class NumEmptyExpectimaxAgent(ExpectimaxAgent):
 	An expectimax agent trying to maximize the number
 	of empty squares.
 	"""
-	def __init__(self, depth):
-		super().__init__({"numEmpty": 1}, depth)
+	def __init__(self, depth, **kwargs):
+		super().__init__({"numEmpty": 1}, depth, **kwargs)
 
 
 class MaxTileCornerExpectimaxAgent(ExpectimaxAgent):
@@ -176,44 +669,44 @@ class MaxTileCornerExpectimaxAgent(ExpectimaxAgent):
 	An expectimax agent trying to place the maximum valued
 	tile in a corner of the board.
 	"""
-	def __init__(self, depth):
-		super().__init__({"maxTileCorner": 1}, depth)
+	def __init__(self, depth, **kwargs):
+		super().__init__({"maxTileCorner": 1}, depth, **kwargs)
 
 class MonotonicSnakeExpectimaxAgent(ExpectimaxAgent):
 	"""
 	An expectimax agent that prefers full bottom row.
 	"""
-	def __init__(self, depth):
-		super().__init__({"snakeMonotonicity": 1}, depth)
+	def __init__(self, depth, **kwargs):
+		super().__init__({"snakeMonotonicity": 1}, depth, **kwargs)
 
 class FullMaxRowExpectimaxAgent(ExpectimaxAgent):
 	"""
 	An expectimax agent that prefers full bottom row.
 	"""
-	def __init__(self, depth):
-		super().__init__({"fullMaxRow": 1}, depth)
+	def __init__(self, depth, **kwargs):
+		super().__init__({"fullMaxRow": 1}, depth, **kwargs)
 
 class TileDiffExpectimaxAgent(ExpectimaxAgent):
 	"""
 	An expectimax agent trying to minimize adjacent tile differences
 	throughout the board.
 	"""
-	def __init__(self, depth):
-		super().__init__({"tileDiff": 1}, depth)
+	def __init__(self, depth, **kwargs):
+		super().__init__({"tileDiff": 1}, depth, **kwargs)
 
 class AscendingRowsExpectimaxAgent(ExpectimaxAgent):
 	"""
 	Expectimax agent that orders values s.t. they are
 	monotonically increasing across rows and columns
 	"""
-	def __init__(self, depth):
-		super().__init__({"monotonicity": 1}, depth)
+	def __init__(self, depth, **kwargs):
+		super().__init__({"monotonicity": 1}, depth, **kwargs)
 
 class WeightedExpectimaxAgent(ExpectimaxAgent):
 	"""
 	Expectimax agent that uses a linear combination of
 	evaluation functions.
 	"""
-	def __init__(self, depth):
-		super().__init__({"score": 7, "maxTile": 7, "numEmpty": 7, "corner": 5,
-						  "tileDiff": 5, "logScore": 18, "monotonicity": 4}, depth)
+	def __init__(self, depth, **kwargs):
+		super().__init__({"score": 7, "maxTile": 7, "numEmpty": 7, "maxTileCorner": 5,
+						  "tileDiff": 5, "logScore": 18, "monotonicity": 4}, depth, **kwargs)
@@ -0,0 +1,238 @@
+# batchBoard.py
+# ---------------
+# Contains the BatchBoard class, which holds many 4x4 boards at once as
+# an array of tile exponents and steps all of them together with NumPy
+# array operations. It is meant for simulating many games at the same
+# time, such as random rollouts, weight tuning and benchmarks.
+
+import numpy as np
+import bitBoard
+from gameObjects import Move
+
+# Integer codes of the moves, in the order used by the move vectors
+LEFT, RIGHT, UP, DOWN = Move.LEFT, Move.RIGHT, Move.UP, Move.DOWN
+MOVES = list(Move)
+
+# NumPy versions of the row lookup tables of bitBoard, built on first use
+leftTable = None
+rightTable = None
+scoreTable = None
+
+ROW_SHIFTS = np.arange(0, 16, 4, dtype=np.uint16)
+
+
+def buildArrayTables():
+	"""
+	Convert the row lookup tables of bitBoard into NumPy arrays.
+	"""
+	global leftTable, rightTable, scoreTable
+	if leftTable is not None:
+		return
+	bitBoard.buildRowTables()
+	leftTable = np.array(bitBoard.rowLeftTable, dtype=np.uint16)
+	rightTable = np.array(bitBoard.rowRightTable, dtype=np.uint16)
+	scoreTable = np.array(bitBoard.rowScoreTable, dtype=np.int64)
+
+
+def encodeRows(exps):
+	"""
+	Pack an (..., 4) array of tile exponents into 16-bit rows.
+	"""
+	exps = exps.astype(np.uint16)
+	return exps[..., 0] | (exps[..., 1] << 4) | (exps[..., 2] << 8) | (exps[..., 3] << 12)
+
+
+def decodeRows(rows):
+	"""
+	Unpack an array of 16-bit rows into an (..., 4) array of tile exponents.
+	"""
+	return ((rows[..., None] >> ROW_SHIFTS) & 0xF).astype(np.uint8)
+
+
+class BatchBoard():
+	"""
+	N boards of size 4, stored as an (N,16) uint8 array of tile exponents
+	(0 = empty, 1 = 2, 2 = 4, ...) in row-major order.
+	"""
+
+	prob2 = .9
+	prob4 = 1 - prob2
+
+	def __init__(self, n=1, exps=None, scores=None, rng=None):
+
+		buildArrayTables()
+
+		# Generator drawing the random tiles and moves, shared with copies
+		self.rng = rng if rng is not None else np.random.default_rng()
+
+		if exps is not None:
+			self.exps = np.array(exps, dtype=np.uint8).reshape(-1, 16)
+		else:
+			# Initialize random grids with either 1, 2 or 3 blocks
+			self.exps = np.zeros((n, 16), dtype=np.uint8)
+			numberStart = self.rng.integers(1, 4, size=n)
+			for k in range(3):
+				self.placeRandomTiles(numberStart > k)
+
+		self.n = self.exps.shape[0]
+
+		if scores is not None:
+			self.scores = np.array(scores, dtype=np.int64).reshape(self.n)
+		else:
+			self.scores = np.zeros(self.n, dtype=np.int64)
+
+	def fromBoards(boards, rng=None):
+		"""
+		Return a BatchBoard holding copies of the given Board instances.
+		"""
+		exps = np.array([board.exponents() for board in boards], dtype=np.uint8).reshape(-1, 16)
+		return BatchBoard(exps=exps, scores=[board.score for board in boards], rng=rng)
+
+	def repeat(board, n, rng=None):
+		"""
+		Return a BatchBoard holding n copies of the given Board.
+		"""
+		single = BatchBoard.fromBoards([board])
+		return BatchBoard(exps=np.repeat(single.exps, n, axis=0),
+						  scores=np.repeat(single.scores, n), rng=rng)
+
+	def copy(self):
+		return BatchBoard(exps=self.exps.copy(), scores=self.scores.copy(), rng=self.rng)
+
+	def values(self):
+		"""
+		Return an (N,4,4) array of tile values.
+		"""
+		values = np.left_shift(1, self.exps.astype(np.int64))
+		values[self.exps == 0] = 0
+		return values.reshape(self.n, 4, 4)
+
+	def rowsAndCols(self, exps=None):
+		"""
+		Return the (N,4) arrays of packed rows and packed columns.
+		"""
+		if exps is None:
+			exps = self.exps
+		grids = exps.reshape(-1, 4, 4)
+		return encodeRows(grids), encodeRows(grids.transpose(0, 2, 1))
+
+	def shiftedExps(self, moves, exps=None):
+		"""
+		Return the exponent array and score gains obtained by applying
+		moves[k] to board k, without modifying the boards.
+		"""
+		if exps is None:
+			exps = self.exps
+		moves = np.broadcast_to(np.asarray(moves), (exps.shape[0],))
+		rows, cols = self.rowsAndCols(exps)
+		newExps = exps.copy()
+		gains = np.zeros(exps.shape[0], dtype=np.int64)
+
+		for move, table in ((LEFT, leftTable), (RIGHT, rightTable)):
+			idx = np.nonzero(moves == move)[0]
+			if len(idx) > 0:
+				newExps[idx] = decodeRows(table[rows[idx]]).reshape(-1, 16)
+				gains[idx] = scoreTable[rows[idx]].sum(axis=1)
+
+		for move, table in ((UP, leftTable), (DOWN, rightTable)):
+			idx = np.nonzero(moves == move)[0]
+			if len(idx) > 0:
+				newExps[idx] = decodeRows(table[cols[idx]]).transpose(0, 2, 1).reshape(-1, 16)
+				gains[idx] = scoreTable[cols[idx]].sum(axis=1)
+
+		return newExps, gains
+
+	def validMoveMask(self, exps=None):
+		"""
+		Return an (N,4) boolean array, whose entry [k, move] is True
+		if move changes board k.
+		"""
+		rows, cols = self.rowsAndCols(exps)
+		mask = np.empty((rows.shape[0], 4), dtype=bool)
+		mask[:, LEFT] = (leftTable[rows] != rows).any(axis=1)
+		mask[:, RIGHT] = (rightTable[rows] != rows).any(axis=1)
+		mask[:, UP] = (leftTable[cols] != cols).any(axis=1)
+		mask[:, DOWN] = (rightTable[cols] != cols).any(axis=1)
+		return mask
+
+	def isGameOver(self):
+		"""
+		Return an (N,) boolean array, True where the game is over.
+		"""
+		return ~self.validMoveMask().any(axis=1)
+
+	def randomValidMoves(self, mask=None):
+		"""
+		Return one uniformly chosen valid move per board, or -1 for
+		boards without any valid move.
+		"""
+		if mask is None:
+			mask = self.validMoveMask()
+		keys = self.rng.random(mask.shape)
+		keys[~mask] = -1
+		moves = keys.argmax(axis=1)
+		moves[~mask.any(axis=1)] = -1
+		return moves
+
+	def shift(self, moves, active=None):
+		"""
+		Shift the tiles of every board according to its move, adding the
+		merge gains to the scores. Boards where active is False are left
+		untouched. Return a boolean array that is True where a board changed.
+		Note that this does *not* generate random blocks after shifting.
+		"""
+		moves = np.broadcast_to(np.asarray(moves), (self.n,))
+		if active is None:
+			active = moves >= 0
+		else:
+			active = active & (moves >= 0)
+
+		idx = np.nonzero(active)[0]
+		newExps, gains = self.shiftedExps(moves[idx], self.exps[idx])
+		changed = np.zeros(self.n, dtype=bool)
+		changed[idx] = (newExps != self.exps[idx]).any(axis=1)
+
+		self.exps[idx] = newExps
+		self.scores[idx] += gains
+		return changed
+
+	def placeRandomTiles(self, mask=None):
+		"""
+		Add one new tile to a random empty square of every board where
+		mask is True. Boards without empty squares are left untouched.
+		"""
+		empty = self.exps == 0
+		if mask is not None:
+			empty &= np.asarray(mask)[:, None]
+
+		idx = np.nonzero(empty.any(axis=1))[0]
+		if len(idx) == 0:
+			return
+		keys = self.rng.random((len(idx), 16))
+		keys[~empty[idx]] = -1
+		cells = keys.argmax(axis=1)
+		newTiles = np.where(self.rng.random(len(idx)) > 1 - self.prob2, 1, 2)
+		self.exps[idx, cells] = newTiles
+
+	def step(self, moves, active=None):
+		"""
+		Apply one move per board and spawn a random tile on every board
+		that changed. Invalid moves leave a board unchanged.
+		Return the boolean array of boards that changed.
+		"""
+		changed = self.shift(moves, active)
+		self.placeRandomTiles(changed)
+		return changed
+
+	def numberEmpty(self):
+		"""
+		Return the number of empty squares of each board.
+		"""
+		return (self.exps == 0).sum(axis=1)
+
+	def maxTile(self):
+		"""
+		Return the value of the highest tile of each board.
+		"""
+		maxExps = self.exps.max(axis=1).astype(np.int64)
+		return np.where(maxExps > 0, np.left_shift(1, maxExps), 0)
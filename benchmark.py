@@ -0,0 +1,245 @@
+# benchmark.py
+# ---------------
+# Times the hot paths of the game engine, the evaluation features and
+# the move of every agent on a fixed corpus of positions, drawn from
+# seeded random games. Results are written as JSON and can be compared
+# against a stored baseline, e.g.
+#	python benchmark.py -o baseline.json
+#	python benchmark.py --baseline baseline.json --threshold 0.2
+
+import argparse
+import hashlib
+import json
+import platform
+import sys
+import time
+import numpy as np
+
+from gameObjects import Board
+from bitBoard import BitBoard
+from evaluators import Evaluator
+from agents import RandomAgent, ExpectimaxAgent
+from main import availableAgents
+
+# Options of the agents whose defaults take seconds per move
+AGENT_OPTIONS = {"MonteCarloAgent": {"rollouts": 50, "workers": 1}}
+
+
+def buildCorpus(positions, seed=0):
+	"""
+	Return positions grids (lists of rows of tile values) with their
+	scores, spread evenly over seeded games of a random agent.
+	"""
+	rng = np.random.default_rng(seed)
+	states = []
+	while len(states) < 4 * positions:
+		board = Board(rng=rng)
+		agent = RandomAgent(rng=rng)
+		while not board.isGameOver():
+			states.append((board.grid, board.score))
+			board = board.getSuccessor(agent.move(board), printOpts=False)
+	step = len(states) / positions
+	return [states[int(k * step)] for k in range(positions)]
+
+
+def corpusFingerprint(corpus):
+	"""
+	Return a short hash of the corpus, to check that two results were
+	measured on the same positions.
+	"""
+	return hashlib.sha1(repr(corpus).encode()).hexdigest()[:12]
+
+
+def makeBoards(corpus, boardClass):
+	boards = []
+	for grid, score in corpus:
+		board = boardClass(config=grid)
+		board.score = score
+		boards.append(board)
+	return boards
+
+
+def timeCalls(call, items, repeat, setup=None):
+	"""
+	Return the mean time of call(item) over the items in microseconds,
+	taking the best of repeat runs. setup(item), if given, prepares
+	the argument of each call outside of the timed loop.
+	"""
+	best = float("inf")
+	for _ in range(repeat):
+		args = [setup(item) for item in items] if setup is not None else items
+		beginTime = time.perf_counter()
+		for arg in args:
+			call(arg)
+		best = min(best, time.perf_counter() - beginTime)
+	return 1e6 * best / len(items)
+
+
+def freshCopy(board):
+	"""
+	Return a copy of board without any cached values.
+	"""
+	board = board.copy()
+	if isinstance(board, Board):
+		board.invalidate()
+	return board
+
+
+def engineBenchmarks(boards, repeat):
+	"""
+	Time the board operations of the search on Board and BitBoard.
+	"""
+	results = {}
+	for boardClass in (Board, BitBoard):
+		name = boardClass.__name__
+		classBoards = [boardClass(config=board.grid) for board in boards]
+		moves = [(board, move) for board in classBoards for move in board.validMoves()]
+
+		results[name + ".copy"] = timeCalls(lambda board: board.copy(), classBoards, repeat)
+		results[name + ".shift"] = timeCalls(lambda args: args[0].shift(args[1]), moves, repeat,
+											 setup=lambda args: (freshCopy(args[0]), args[1]))
+		results[name + ".validMoves"] = timeCalls(lambda board: board.validMoves(), classBoards, repeat,
+												  setup=freshCopy)
+		results[name + ".getAllSuccessors"] = timeCalls(lambda args: args[0].getAllSuccessors(args[1]),
+														moves, repeat,
+														setup=lambda args: (freshCopy(args[0]), args[1]))
+	return results
+
+
+def evaluatorBenchmarks(boards, repeat):
+	"""
+	Time every evaluation feature, uncompiled and compiled, on Board.
+	"""
+	results = {}
+	for feature in Evaluator.features:
+		function = getattr(Evaluator, feature)
+		compiled = Evaluator.compile({feature: 1})
+		results["Evaluator." + feature] = timeCalls(function, boards, repeat, setup=freshCopy)
+		results["CompiledEvaluator." + feature] = timeCalls(compiled, boards, repeat, setup=freshCopy)
+	compiled = Evaluator.compile(Evaluator.uniformWeights())
+	results["CompiledEvaluator.uniformWeights"] = timeCalls(compiled, boards, repeat, setup=freshCopy)
+	return results
+
+
+def makeAgent(agentClass, depth, seed):
+	"""
+	Return an agent of the given class with a seeded generator, like
+	Game instantiates it.
+	"""
+	if issubclass(agentClass, ExpectimaxAgent):
+		return agentClass(depth=depth)
+	return agentClass(rng=np.random.default_rng(seed), **AGENT_OPTIONS.get(agentClass.__name__, {}))
+
+
+def agentBenchmarks(boards, repeat, depth, seed):
+	"""
+	Time the move of every agent of main.availableAgents on Board.
+	"""
+	results = {}
+	for agentClass in availableAgents:
+		agent = makeAgent(agentClass, depth, seed)
+		try:
+			# Learning agents update on the previous position, which
+			# belongs to another game here
+			with np.errstate(all="ignore"):
+				results[agentClass.__name__ + ".move"] = timeCalls(agent.move, boards, repeat, setup=freshCopy)
+		finally:
+			agent.close()
+	return results
+
+
+def runBenchmarks(positions=50, seed=0, repeat=5, depth=2, agentPositions=5, groups=("engine", "evaluator", "agent")):
+	"""
+	Run the benchmark groups and return the results as a dict holding
+	the timings in microseconds per call and a description of the run.
+	"""
+	corpus = buildCorpus(positions, seed)
+	boards = makeBoards(corpus, Board)
+
+	timings = {}
+	if "engine" in groups:
+		timings.update(engineBenchmarks(boards, repeat))
+	if "evaluator" in groups:
+		timings.update(evaluatorBenchmarks(boards, repeat))
+	if "agent" in groups:
+		# Agents search whole trees per move, so they run on fewer positions
+		step = max(1, positions // agentPositions)
+		timings.update(agentBenchmarks(boards[::step][:agentPositions], max(1, repeat // 2), depth, seed))
+
+	return {"meta": {"positions": positions,
+					 "seed": seed,
+					 "repeat": repeat,
+					 "depth": depth,
+					 "agentPositions": agentPositions,
+					 "corpus": corpusFingerprint(corpus),
+					 "python": platform.python_version(),
+					 "numpy": np.__version__},
+			"timings": timings}
+
+
+def compareResults(results, baseline, threshold):
+	"""
+	Return a list of (name, baseline time, time, ratio, regressed) for
+	every benchmark in both results, where regressed is True if the
+	benchmark got slower by more than the threshold fraction.
+	"""
+	rows = []
+	for name, timing in results["timings"].items():
+		if name in baseline["timings"]:
+			baseTiming = baseline["timings"][name]
+			ratio = timing / baseTiming if baseTiming > 0 else float("inf")
+			rows.append((name, baseTiming, timing, ratio, ratio > 1 + threshold))
+	return rows
+
+
+def printResults(results):
+	for name, timing in results["timings"].items():
+		print("{:<44} {:>12.2f} us".format(name, timing))
+
+
+def printComparison(rows):
+	print("{:<44} {:>12} {:>12} {:>8}".format("benchmark", "baseline us", "current us", "ratio"))
+	for name, baseTiming, timing, ratio, regressed in rows:
+		print("{:<44} {:>12.2f} {:>12.2f} {:>7.2f}x{}".format(
+			name, baseTiming, timing, ratio, "  REGRESSION" if regressed else ""))
+
+
+if __name__ == '__main__':
+
+	parser = argparse.ArgumentParser(description='Time the engine, evaluator and agent hot paths.')
+	parser.add_argument("-o", "--output", default=None, help="file to write the results to, as JSON")
+	parser.add_argument("--baseline", default=None, help="JSON results of an earlier run to compare against")
+	parser.add_argument("--threshold", default=0.2, type=float,
+						help="fraction by which a benchmark may be slower than the baseline")
+	parser.add_argument("-n", "--positions", default=50, type=int, help="number of positions in the corpus")
+	parser.add_argument("--seed", default=0, type=int, help="seed of the games the corpus is drawn from")
+	parser.add_argument("-r", "--repeat", default=5, type=int, help="number of runs, of which the best is kept")
+	parser.add_argument("-d", "--depth", default=2, type=int, help="depth of the Expectimax agents")
+	parser.add_argument("--agent-positions", default=5, type=int,
+						help="number of positions the agents move on")
+	parser.add_argument("--groups", default="engine,evaluator,agent",
+						help="comma-separated benchmark groups to run (engine, evaluator, agent)")
+	args = parser.parse_args()
+
+	results = runBenchmarks(positions=args.positions, seed=args.seed, repeat=args.repeat, depth=args.depth,
+							agentPositions=args.agent_positions, groups=args.groups.split(","))
+
+	if args.output is not None:
+		with open(args.output, "w") as f:
+			json.dump(results, f, indent=2, sort_keys=True)
+
+	if args.baseline is None:
+		printResults(results)
+		sys.exit(0)
+
+	with open(args.baseline) as f:
+		baseline = json.load(f)
+	if baseline["meta"]["corpus"] != results["meta"]["corpus"]:
+		print("Warning: the baseline was measured on a different corpus of positions.")
+	rows = compareResults(results, baseline, args.threshold)
+	printComparison(rows)
+	regressions = [row[0] for row in rows if row[4]]
+	if regressions:
+		print("{} benchmarks slower than the baseline by more than {:.0%}: {}".format(
+			len(regressions), args.threshold, ", ".join(regressions)))
+		sys.exit(1)
@@ -0,0 +1,435 @@
+# bitBoard.py
+# ---------------
+# Contains the BitBoard class, an alternate backend for Board which
+# packs the 4x4 grid into a single 64-bit integer of 4-bit tile
+# exponents and performs moves through precomputed row lookup tables.
+# It exposes the same public methods as Board, so that agents and
+# evaluators can run on it unchanged.
+
+import numpy as np
+from gameObjects import Board, Move, MOVE_CODES, canonicalLines
+
+ROW_MASK = 0xFFFF
+
+# Lookup tables indexed by a 16-bit row, in which the tile in column j
+# is stored as an exponent in bits 4j..4j+3 (0 = empty, 1 = 2, 2 = 4, ...).
+# They are built on first use, see buildRowTables.
+rowLeftTable = None
+rowRightTable = None
+rowScoreTable = None
+rowMovableTable = None
+
+
+def shiftRowExponents(exps):
+	"""
+	Shift a list of tile exponents to the left, merging equal tiles once.
+	Return the new exponents and the score gained by the merges.
+	"""
+	tiles = [e for e in exps if e != 0]
+	result = []
+	gain = 0
+	i = 0
+	while i < len(tiles):
+		# Two tiles of value 32768 cannot be merged, as their sum does
+		# not fit into four bits.
+		if i + 1 < len(tiles) and tiles[i] == tiles[i + 1] and tiles[i] < 15:
+			result.append(tiles[i] + 1)
+			gain += 2 ** (tiles[i] + 1)
+			i += 2
+		else:
+			result.append(tiles[i])
+			i += 1
+	result += [0] * (len(exps) - len(result))
+	return result, gain
+
+
+def encodeRow(exps):
+	"""Pack four tile exponents into a 16-bit row."""
+	return exps[0] | (exps[1] << 4) | (exps[2] << 8) | (exps[3] << 12)
+
+
+def decodeRow(row):
+	"""Unpack a 16-bit row into four tile exponents."""
+	return [(row >> (4 * j)) & 0xF for j in range(4)]
+
+
+def buildRowTables():
+	"""
+	Precompute the result of moving every possible row to the left and
+	to the right, along with the score gained by that move.
+	"""
+	global rowLeftTable, rowRightTable, rowScoreTable, rowMovableTable
+	if rowLeftTable is not None:
+		return
+
+	left = [0] * 65536
+	right = [0] * 65536
+	score = [0] * 65536
+	for row in range(65536):
+		exps = decodeRow(row)
+		shifted, gain = shiftRowExponents(exps)
+		left[row] = encodeRow(shifted)
+		score[row] = gain
+
+		revShifted, _ = shiftRowExponents(list(reversed(exps)))
+		right[row] = encodeRow(list(reversed(revShifted)))
+
+	# Whether a row changes when moved to the left or to the right
+	movable = [left[row] != row or right[row] != row for row in range(65536)]
+
+	rowLeftTable, rowRightTable, rowScoreTable, rowMovableTable = left, right, score, movable
+
+
+def transpose(bits):
+	"""
+	Transpose a packed board, such that columns become rows.
+	"""
+	a1 = bits & 0xF0F00F0FF0F00F0F
+	a2 = bits & 0x0000F0F00000F0F0
+	a3 = bits & 0x0F0F00000F0F0000
+	a = a1 | (a2 << 12) | (a3 >> 12)
+	b1 = a & 0xFF00FF0000FF00FF
+	b2 = a & 0x00FF00FF00000000
+	b3 = a & 0x00000000FF00FF00
+	return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def splitRows(bits):
+	"""Return the four 16-bit rows of a packed board."""
+	return (bits & ROW_MASK, (bits >> 16) & ROW_MASK, (bits >> 32) & ROW_MASK, bits >> 48)
+
+
+def shiftRows(bits, table):
+	"""
+	Apply a row table to each of the four rows of a packed board.
+	Return the new board and the score gained.
+	"""
+	row0 = bits & ROW_MASK
+	row1 = (bits >> 16) & ROW_MASK
+	row2 = (bits >> 32) & ROW_MASK
+	row3 = bits >> 48
+	result = table[row0] | (table[row1] << 16) | (table[row2] << 32) | (table[row3] << 48)
+	gain = rowScoreTable[row0] + rowScoreTable[row1] + rowScoreTable[row2] + rowScoreTable[row3]
+	return result, gain
+
+
+class BitBoard():
+	"""
+	A 4x4 board packed into a 64-bit integer of tile exponents.
+	"""
+
+	__slots__ = ("size", "bits", "score", "gridCache", "mostRecentRandomTilePos", "rng")
+
+	LEFT = Move.LEFT
+	RIGHT = Move.RIGHT
+	UP = Move.UP
+	DOWN = Move.DOWN
+
+	prob2 = .9
+	prob4 = 1 - prob2
+
+	def __init__(self, size=4, config=None, rng=None):
+		"""
+		Initialize a board like Board, including the rng argument.
+		"""
+
+		if size != 4:
+			raise ValueError("BitBoard only supports boards of size 4.")
+
+		buildRowTables()
+
+		self.size = size
+		self.rng = rng if rng is not None else np.random.default_rng()
+
+		self.bits = 0
+		self.score = 0
+		self.gridCache = None
+
+		# The position at which the most recent random tile has been inserted
+		self.mostRecentRandomTilePos = None
+
+		if config is not None:
+			self.setGrid(config)
+		else:
+			# Initialize random grid with either 1, 2 or 3 blocks
+			numberStart = self.rng.integers(1, 4)
+			self.placeRandomTile(numberStart)
+
+	def __str__(self):
+		return Board.__str__(self)
+
+	@property
+	def grid(self):
+		"""
+		Return the board as a list of rows of tile values, like Board.grid.
+		The result is cached until the board changes and must not be mutated.
+		"""
+		if self.gridCache is None:
+			self.gridCache = [[self.getTile(i, j) for j in range(4)] for i in range(4)]
+		return self.gridCache
+
+	def setGrid(self, grid):
+		"""
+		Set the board from a list of rows of tile values.
+		"""
+		bits = 0
+		for i in range(4):
+			for j in range(4):
+				val = grid[i][j]
+				if val != 0:
+					bits |= (int(val).bit_length() - 1) << (4 * (4 * i + j))
+		self.bits = bits
+		self.gridCache = None
+
+	def getTile(self, i, j):
+		"""
+		Return the value of the tile at position i,j.
+		"""
+		exp = (self.bits >> (4 * (4 * i + j))) & 0xF
+		return 0 if exp == 0 else 1 << exp
+
+	def copy(self):
+		newBoard = BitBoard.__new__(BitBoard)
+		newBoard.size = self.size
+		newBoard.bits = self.bits
+		newBoard.score = self.score
+		newBoard.gridCache = None
+		newBoard.mostRecentRandomTilePos = self.mostRecentRandomTilePos
+		newBoard.rng = self.rng
+		return newBoard
+
+	def key(self):
+		"""
+		Return a hashable representation of the board state, used to
+		look up positions in caches.
+		"""
+		return (self.bits, self.score)
+
+	def canonicalKey(self):
+		"""
+		Return the smallest key among the 8 rotations and reflections of
+		the board and the transform that maps the board onto it, like
+		Board.canonicalKey.
+		"""
+		lines, transform = canonicalLines(*self.packedLines())
+		return (lines, self.score), transform
+
+	def packedLines(self):
+		"""
+		Return the rows and the columns of the board as two tuples of
+		16-bit integers, like Board.packedLines.
+		"""
+		return splitRows(self.bits), splitRows(transpose(self.bits))
+
+	def exponents(self):
+		"""
+		Return the tile exponents of the board as a flat list in row-major
+		order, like Board.exponents.
+		"""
+		bits = self.bits
+		return [(bits >> (4 * k)) & 0xF for k in range(16)]
+
+	def initBoard(self):
+		self.bits = 0
+		self.score = 0
+		self.gridCache = None
+
+		numberStart = self.rng.integers(1, 4)
+		self.placeRandomTile(numberStart)
+
+	def emptySquares(self):
+		"""
+		Return a list of coordinates tuples of empty squares.
+		"""
+		res = []
+		bits = self.bits
+		for k in range(16):
+			if (bits >> (4 * k)) & 0xF == 0:
+				res.append((k >> 2, k & 3))
+		return res
+
+	def shiftedBits(self, move):
+		"""
+		Return the packed board and score gain resulting from move,
+		without modifying the board.
+		"""
+		move = MOVE_CODES.get(move)
+		if move == self.LEFT:
+			return shiftRows(self.bits, rowLeftTable)
+		elif move == self.RIGHT:
+			return shiftRows(self.bits, rowRightTable)
+		elif move == self.UP:
+			bits, gain = shiftRows(transpose(self.bits), rowLeftTable)
+			return transpose(bits), gain
+		elif move == self.DOWN:
+			bits, gain = shiftRows(transpose(self.bits), rowRightTable)
+			return transpose(bits), gain
+		else:
+			raise ValueError("Invalid move: Only UP, LEFT, BOTTOM, RIGHT \
+are permitted.")
+
+	def validMoves(self):
+		"""
+		Return a list of valid moves.
+		"""
+		moves = []
+		rows = splitRows(self.bits)
+		if any(rowLeftTable[row] != row for row in rows):
+			moves.append(self.LEFT)
+		if any(rowRightTable[row] != row for row in rows):
+			moves.append(self.RIGHT)
+		cols = splitRows(transpose(self.bits))
+		if any(rowLeftTable[col] != col for col in cols):
+			moves.append(self.UP)
+		if any(rowRightTable[col] != col for col in cols):
+			moves.append(self.DOWN)
+		return moves
+
+	def shift(self, move):
+		"""
+		Shift all tiles in the board according to move.
+		Note that this does *not* generate a random block after shifting.
+		The latter is implemented in placeRandomTile.
+		"""
+		self.bits, gain = self.shiftedBits(move)
+		self.score += gain
+		self.gridCache = None
+
+	def makeMove(self, move):
+		"""
+		Shift the board in place according to move and return an undo
+		record, which unmakeMove uses to restore the previous state.
+		"""
+		undo = (self.bits, self.score, self.mostRecentRandomTilePos)
+		self.shift(move)
+		return undo
+
+	def unmakeMove(self, undo):
+		"""
+		Restore the state saved by makeMove.
+		"""
+		self.bits, self.score, self.mostRecentRandomTilePos = undo
+		self.gridCache = None
+
+	def placeRandomTile(self, num):
+		"""
+		Add num new tiles to random empty squares of the board.
+		"""
+
+		emptySquares = self.emptySquares()
+		locations = self.rng.choice(len(emptySquares), size=num, replace=False)
+		for k in locations:
+			i, j = emptySquares[k]
+			choice = self.rng.random()
+			if choice > 1 - self.prob2:
+				exp = 1
+			else:
+				exp = 2
+			self.bits |= exp << (4 * (4 * i + j))
+			self.mostRecentRandomTilePos = (i, j)
+		self.gridCache = None
+
+	def isGameOver(self):
+		"""
+		Return True if the game is over, False otherwise.
+		The game is over when no row and no column can move, which is
+		checked with eight lookups in the movable row table.
+		"""
+		movable = rowMovableTable
+		bits = self.bits
+		if movable[bits & ROW_MASK] or movable[(bits >> 16) & ROW_MASK] or \
+		   movable[(bits >> 32) & ROW_MASK] or movable[bits >> 48]:
+			return False
+		cols = transpose(bits)
+		return not (movable[cols & ROW_MASK] or movable[(cols >> 16) & ROW_MASK] or
+					movable[(cols >> 32) & ROW_MASK] or movable[cols >> 48])
+
+	def maxTile(self):
+		"""
+		Return the value of the tile with the highest value.
+		"""
+		bits = self.bits
+		maxExp = 0
+		for k in range(16):
+			exp = (bits >> (4 * k)) & 0xF
+			if exp > maxExp:
+				maxExp = exp
+		return 0 if maxExp == 0 else 1 << maxExp
+
+	def maxTilePosition(self):
+		"""
+		Return position of maxTile.
+		"""
+		bits = self.bits
+		maxExp = 0
+		bestPos = (None, None)
+		for k in range(16):
+			exp = (bits >> (4 * k)) & 0xF
+			if exp > maxExp:
+				maxExp = exp
+				bestPos = (k >> 2, k & 3)
+		return bestPos
+
+	def getNeighbors(self, pos):
+		"""
+		Returns the neighbor locations of any given tile location.
+		"""
+		return Board.getNeighbors(self, pos)
+
+	def numberEmpty(self):
+		"""
+		Return the number of empty squares.
+		"""
+		return len(self.emptySquares())
+
+	def placeTile(self, i, j, val):
+		"""
+		Place a tile with a given value at position i,j on the board.
+		"""
+
+		if i >= self.size or j >= self.size:
+			raise ValueError("Invalid tile position.")
+
+		# ensure proper usage
+		if self.getTile(i, j) != 0:
+			raise ValueError("Tried to place a tile in a non-empty square.")
+
+		self.bits |= (int(val).bit_length() - 1) << (4 * (4 * i + j))
+		self.gridCache = None
+
+	def removeTile(self, i, j):
+		"""
+		Remove the tile at position i,j, undoing placeTile.
+		"""
+		self.bits &= ~(0xF << (4 * (4 * i + j)))
+		self.gridCache = None
+
+	def getSuccessor(self, move, printOpts=True):
+		"""
+		Return a random successor board.
+		"""
+		successor = self.copy()
+		if MOVE_CODES.get(move) in successor.validMoves():
+			successor.shift(move)
+			successor.placeRandomTile(1)
+		if printOpts:
+			print(successor, "Score: {}".format(successor.score))
+		return successor
+
+	def iterSuccessors(self, move):
+		"""
+		Yield the possible successor states of move and their associated
+		probabilities one at a time, generated in place like
+		Board.iterSuccessors.
+		"""
+		return Board.iterSuccessors(self, move)
+
+	def getAllSuccessors(self, move):
+		"""
+		Return the possible successor states and their associated
+		probabilities in a list of tuples.
+		"""
+		return Board.getAllSuccessors(self, move)
+
+	def manhattanDistance(self, pos1, pos2):
+		return Board.manhattanDistance(self, pos1, pos2)
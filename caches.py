@@ -0,0 +1,71 @@
+# caches.py
+# ---------------
+# Contains the LRUCache class, a bounded key-value store with
+# least-recently-used eviction and hit/miss counters, which the
+# search agents use to remember the values of positions they have
+# already evaluated.
+
+from collections import OrderedDict
+
+class LRUCache():
+	"""
+	A dictionary holding at most maxSize entries. When it is full, the
+	entry that was least recently read or written is evicted.
+	"""
+
+	def __init__(self, maxSize):
+		if maxSize <= 0:
+			raise ValueError("Cache size must be positive.")
+		self.maxSize = maxSize
+		self.entries = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def __len__(self):
+		return len(self.entries)
+
+	def get(self, key):
+		"""
+		Return the value stored for key, or None if there is none.
+		"""
+		value = self.entries.get(key)
+		if value is None:
+			self.misses += 1
+			return None
+		self.entries.move_to_end(key)
+		self.hits += 1
+		return value
+
+	def put(self, key, value):
+		"""
+		Store value for key, evicting the least recently used entry
+		if the cache is full.
+		"""
+		self.entries[key] = value
+		self.entries.move_to_end(key)
+		if len(self.entries) > self.maxSize:
+			self.entries.popitem(last=False)
+			self.evictions += 1
+
+	def clear(self):
+		"""
+		Remove all entries. The counters are kept.
+		"""
+		self.entries.clear()
+
+	def hitRate(self):
+		"""
+		Return the fraction of lookups that found an entry.
+		"""
+		lookups = self.hits + self.misses
+		if lookups == 0:
+			return 0.
+		return self.hits * 1. / lookups
+
+	def stats(self):
+		"""
+		Return the counters of the cache in a dictionary.
+		"""
+		return {"size": len(self.entries), "hits": self.hits, "misses": self.misses,
+				"evictions": self.evictions, "hitRate": self.hitRate()}
@@ -5,7 +5,11 @@
 # of a particular 2048 board state.
 
 import numpy as np
+import math
+import time
 import sys
+from bitBoard import decodeRow
+from batchBoard import encodeRows
 
 class Evaluator():
 
@@ -32,6 +36,64 @@ class Evaluator():
 					"logScore": 1, "fullMaxRow": 1}
 		return weights
 
+	# Names of all evaluation functions that can be weighted
+	features = ("score", "maxTile", "numEmpty", "maxTileCorner", "tileDiff",
+				"monotonicity", "snakeMonotonicity", "snakeMonotonicityGeometric",
+				"logScore", "fullMaxRow")
+
+	# Features whose value does not change when the board is rotated or
+	# reflected (see Board.canonicalKey)
+	symmetricFeatures = ("score", "maxTile", "numEmpty", "logScore")
+
+	def isSymmetric(weights):
+		"""
+		Return True if every weighted feature is invariant under the
+		symmetries of the board, such that symmetric boards have equal values.
+		"""
+		return all(feature in Evaluator.symmetricFeatures
+				   for (feature, weight) in weights.items() if weight != 0)
+
+	def compile(weights):
+		"""
+		Return a CompiledEvaluator computing the same value as
+		evaluate(state, weights), checking the weights only once.
+		"""
+		return CompiledEvaluator(weights)
+
+	def checkFeatures(weights):
+		"""
+		Raise a ValueError if weights contains an unknown feature.
+		"""
+		unknown = [feature for feature in weights if feature not in Evaluator.features]
+		if unknown:
+			raise ValueError("Unknown evaluation features: {}. Options: {}".format(
+				", ".join(unknown), ", ".join(Evaluator.features)))
+
+	def evaluateBatch(boards, weights, scores=None):
+		"""
+		Return the values of evaluate for N boards of size 4 at once.
+		boards = (N,16) array of tile exponents in row-major order
+			(0 = empty, 1 = 2, 2 = 4, ...), as stored by BatchBoard
+		scores = (N,) array of game scores, needed by score and logScore
+		Rows are packed with 4 bits per tile, so exponents above 15 (tiles
+		of 65536 and more) raise a ValueError; evaluate such boards one by one.
+		"""
+		Evaluator.checkFeatures(weights)
+		exps = np.asarray(boards, dtype=np.uint8).reshape(-1, 16)
+		if exps.size > 0 and exps.max() > 15:
+			raise ValueError("evaluateBatch only supports tiles up to 32768.")
+		if scores is None:
+			if weights.get("score", 0) > 0 or weights.get("logScore", 0) > 0:
+				raise ValueError("The score and logScore features need the scores of the boards.")
+			scores = np.zeros(exps.shape[0], dtype=np.int64)
+		batch = BatchScan(exps, np.asarray(scores))
+
+		value = np.zeros(exps.shape[0])
+		for (feature, weight) in weights.items():
+			if weight > 0:
+				value += weight * getattr(BatchScan, feature)(batch)
+		return value
+
 	def evaluate(state, weights):
 		value = 0
 		for (feature, weight) in weights.items():
@@ -49,7 +111,10 @@ class Evaluator():
 		return state.maxTile()
 
 	def numEmpty(state):
-		return state.numberEmpty()
+		lines = state.packedLines()
+		if lines is None:
+			return state.numberEmpty()
+		return numEmptyFromLines(lines[0])
 
 	def maxTileCorner(state):
 		maxPos = state.maxTilePosition()
@@ -62,29 +127,41 @@ class Evaluator():
 		Returns the total difference between the values of
 		neighboring tiles.
 		"""
+		lines = state.packedLines()
+		if lines is None:
+			return Evaluator.tileDiffScan(state)
+		return tileDiffFromLines(state, *lines)
+
+	def tileDiffScan(state):
+		"""
+		Computes tileDiff by visiting every tile and its neighbors.
+		"""
+		exps = state.exponents()
+		size = state.size
 		diff = 0
-		for i in range(state.size):
-			for j in range(state.size):
+		for i in range(size):
+			for j in range(size):
 				neighbors = state.getNeighbors((i,j))
 				for x, y in neighbors:
-					val1 = state.grid[x][y]
-					val2 = state.grid[i][j]
-					if val1 != 0:
-						val1 = int(np.log2(val1))
-					if val2 != 0:
-						val2 = int(np.log2(val2))
-					diff += np.abs(val1 - val2)
+					diff += abs(exps[x * size + y] - exps[i * size + j])
 		return -diff
 
 	def monotonicity(state):
 		"""Return the degree to which the board is monotonic"""
+		lines = state.packedLines()
+		if lines is None:
+			return Evaluator.monotonicityScan(state)
+		return monotonicityFromLines(*lines)
+
+	def monotonicityScan(state):
+		"""Computes monotonicity by visiting every row and column."""
 
-		def rowDiff(stateRow):
+		def rowDiff(rowExps):
 			""" Returns the severity of the differences breaking
 			monotonicity within a row. """
 			diff = 0
 
-			logVals = [np.log2(i + 1) for i in stateRow]
+			logVals = [logPlusOne(exp) for exp in rowExps]
 			prevVal = 0
 			val = 0
 			for i in range(len(logVals)):
@@ -97,14 +174,13 @@ class Evaluator():
 
 		# Optimal monotonicity for maximum in bottom-right corner
 		totalDiff = 0
+		exps = state.exponents()
+		size = state.size
 
-		for i in range(state.size):
+		for i in range(size):
 			# Penalize rows closer to max tile more
-			totalDiff += rowDiff(state.grid[i]) * (state.size - i)
-			col = []
-			for row in range(state.size):
-				col.append(state.grid[row][i])
-			totalDiff += rowDiff(col) * i
+			totalDiff += rowDiff(exps[i * size:(i + 1) * size]) * (size - i)
+			totalDiff += rowDiff(exps[i::size]) * i
 
 		return -1 * totalDiff
 
@@ -116,6 +192,13 @@ class Evaluator():
 		9ABC
 		GFED
 		"""
+		lines = state.packedLines()
+		if lines is None:
+			return Evaluator.snakeMonotonicityScan(state)
+		return snakeMonotonicityFromLines(lines[0])
+
+	def snakeMonotonicityScan(state):
+		"""Computes snakeMonotonicity by walking along the snake."""
 
 		# Optimal monotonicity for maximum in bottom-right corner
 		totalDiff = 0
@@ -127,9 +210,11 @@ class Evaluator():
 			else:
 				positions += [(row, i) for i in reversed(range(4))]
 
+		exps = state.exponents()
+		size = state.size
 		for i in range(1, len(positions)):
-			currVal = np.log2(state.grid[positions[i][0]][positions[i][1]] + 1)
-			prevVal = np.log2(state.grid[positions[i - 1][0]][positions[i - 1][1]] + 1)
+			currVal = logPlusOne(exps[positions[i][0] * size + positions[i][1]])
+			prevVal = logPlusOne(exps[positions[i - 1][0] * size + positions[i - 1][1]])
 
 			if currVal < prevVal:
 				totalDiff += (prevVal - currVal) * prevVal
@@ -156,10 +241,12 @@ class Evaluator():
 			else:
 				positions += [(row, i) for i in reversed(range(4))]
 
+		exps = state.exponents()
+		size = state.size
 		value = 0
 		r = 0.25
 		for i in range(len(positions)):
-			value += state.grid[positions[i][0]][positions[i][1]] * r**i
+			value += tileValue(exps[positions[i][0] * size + positions[i][1]]) * r**i
 
 		return value
 
@@ -168,13 +255,465 @@ class Evaluator():
 		if state.score == 0:
 			return 0
 
-		return np.log2(state.score)
+		return math.log2(state.score)
 
 	def fullMaxRow(state):
 		""" Returns how full the row with the max tile is. """
 		rowIndex, colIndex = state.maxTilePosition()
-		empty = 0
-		for col in range(state.size):
-			if state.grid[rowIndex][col] == 0:
-				empty += 1
-		return -1 * empty
+		size = state.size
+		return -1 * state.exponents()[rowIndex * size:(rowIndex + 1) * size].count(0)
+
+
+class CompiledEvaluator():
+	"""
+	A weighted sum of evaluation functions, prepared once for a weight
+	dictionary and then called with a state. Unknown features raise a
+	ValueError on construction, and features with a non-positive weight
+	are dropped, as they are ignored by Evaluator.evaluate.
+	All features are computed from a single scan of the tile exponents.
+	"""
+
+	def __init__(self, weights):
+		Evaluator.checkFeatures(weights)
+
+		self.weights = dict(weights)
+		self.terms = [(getattr(CompiledEvaluator, feature), weight)
+					  for (feature, weight) in weights.items() if weight > 0]
+		self.features = [feature for (feature, weight) in weights.items() if weight > 0]
+
+		# Which parts of the scan are needed by the features
+		self.needsLogs = "monotonicity" in self.features or "snakeMonotonicity" in self.features
+		self.needsLines = "tileDiff" in self.features or self.needsLogs
+		if self.needsLines:
+			buildLineTables()
+
+		# Neighbor pairs of tileDiff and cell order of the snake, per board size
+		self.neighborPairs = {}
+		self.snakeOrders = {}
+
+		# Seconds spent on the scan and on each feature, while profiling
+		self.featureTimes = None
+
+	def __call__(self, state):
+		if self.featureTimes is not None:
+			return self.profiledCall(state)
+		scan = self.scan(state)
+		value = 0
+		for (feature, weight) in self.terms:
+			value += weight * feature(self, state, scan)
+		return value
+
+	def startProfiling(self):
+		"""
+		Time the scan and every feature of the following calls, adding
+		up the seconds in featureTimes. Calling it again resets the times.
+		"""
+		self.featureTimes = dict.fromkeys(["scan"] + self.features, 0.)
+
+	def profiledCall(self, state):
+		"""
+		Return the value of state like __call__, timing each step.
+		"""
+		times = self.featureTimes
+		beginTime = time.perf_counter()
+		scan = self.scan(state)
+		endTime = time.perf_counter()
+		times["scan"] += endTime - beginTime
+		value = 0
+		for name, (feature, weight) in zip(self.features, self.terms):
+			beginTime = endTime
+			value += weight * feature(self, state, scan)
+			endTime = time.perf_counter()
+			times[name] += endTime - beginTime
+		return value
+
+	def scan(self, state):
+		"""
+		Read the tile exponents once in row-major order, collecting
+		log2(value + 1) where needed, the number of empty squares and
+		the value and position of the largest tile.
+		"""
+		size = state.size
+		exps = state.exponents()
+		numEmpty = exps.count(0)
+		maxExp = max(exps)
+		if maxExp == 0:
+			maxVal = 0
+			maxPos = (None, None)
+		else:
+			maxVal = 1 << maxExp
+			maxIndex = exps.index(maxExp)
+			maxPos = (maxIndex // size, maxIndex % size)
+
+		lines = state.packedLines() if self.needsLines else None
+		if lines is None and self.needsLogs:
+			logs = [logPlusOne(exp) for exp in exps]
+		else:
+			logs = None
+		return exps, logs, numEmpty, maxVal, maxPos, lines
+
+	def snakeOrder(self, size):
+		"""
+		Return the row-major cell indices of the snake in the top-left 4x4
+		square of a board of the given size, or None if the board is smaller,
+		in which case Evaluator.evaluate skips the snake features.
+		"""
+		if size not in self.snakeOrders:
+			if size < 4:
+				self.snakeOrders[size] = None
+			else:
+				self.snakeOrders[size] = [row * size + (i if row % 2 == 0 else 3 - i)
+										  for row in range(4) for i in range(4)]
+		return self.snakeOrders[size]
+
+	def score(self, state, scan):
+		return state.score
+
+	def maxTile(self, state, scan):
+		return scan[3]
+
+	def numEmpty(self, state, scan):
+		return scan[2]
+
+	def maxTileCorner(self, state, scan):
+		maxI, maxJ = scan[4]
+		dist = abs(state.size - 1 - maxI) + abs(state.size - 1 - maxJ)
+		return -1. * dist
+
+	def tileDiff(self, state, scan):
+		lines = scan[5]
+		if lines is not None:
+			return tileDiffFromLines(state, *lines)
+		exps = scan[0]
+		pairs = self.neighborPairs.get(state.size)
+		if pairs is None:
+			pairs = neighborPairs(state)
+			self.neighborPairs[state.size] = pairs
+		diff = 0
+		for a, b in pairs:
+			diff += abs(exps[a] - exps[b])
+		return -diff
+
+	def monotonicity(self, state, scan):
+		lines = scan[5]
+		if lines is not None:
+			return monotonicityFromLines(*lines)
+		logs = scan[1]
+		size = state.size
+
+		def rowDiff(logVals):
+			diff = 0
+			prevVal = 0
+			for val in logVals:
+				# if monotonicity is broken, penalize
+				if val < prevVal:
+					diff += (prevVal - val) * prevVal
+				prevVal = val
+			return diff
+
+		totalDiff = 0
+		for i in range(size):
+			# Penalize rows closer to max tile more
+			totalDiff += rowDiff(logs[i * size:(i + 1) * size]) * (size - i)
+			totalDiff += rowDiff(logs[i::size]) * i
+		return -1 * totalDiff
+
+	def snakeMonotonicity(self, state, scan):
+		lines = scan[5]
+		if lines is not None:
+			return snakeMonotonicityFromLines(lines[0])
+		order = self.snakeOrder(state.size)
+		if order is None:
+			return 0
+		logs = scan[1]
+		totalDiff = 0
+		for i in range(1, len(order)):
+			currVal = logs[order[i]]
+			prevVal = logs[order[i - 1]]
+			if currVal < prevVal:
+				totalDiff += (prevVal - currVal) * prevVal
+		return -1 * totalDiff
+
+	def snakeMonotonicityGeometric(self, state, scan):
+		order = self.snakeOrder(state.size)
+		if order is None:
+			return 0
+		exps = scan[0]
+		value = 0
+		r = 0.25
+		for i, index in enumerate(order):
+			value += tileValue(exps[index]) * r**i
+		return value
+
+	def logScore(self, state, scan):
+		return Evaluator.logScore(state)
+
+	def fullMaxRow(self, state, scan):
+		exps = scan[0]
+		rowIndex = scan[4][0]
+		size = state.size
+		return -1 * exps[rowIndex * size:(rowIndex + 1) * size].count(0)
+
+
+def tileValue(exp):
+	"""Return the value of the tile with exponent exp, or 0 for an empty square."""
+	return 1 << exp if exp != 0 else 0
+
+def logPlusOne(exp):
+	"""Return log2(value + 1) for the tile with exponent exp."""
+	if exp < len(logPlusOneOfExp):
+		return logPlusOneOfExp[exp]
+	return math.log2((1 << exp) + 1)
+
+def neighborPairs(state):
+	"""
+	Return the pairs of row-major cell indices compared by tileDiff,
+	following state.getNeighbors.
+	"""
+	pairs = []
+	for i in range(state.size):
+		for j in range(state.size):
+			for x, y in state.getNeighbors((i, j)):
+				pairs.append((x * state.size + y, i * state.size + j))
+	return pairs
+
+
+# Lookup tables indexed by a packed row or column of four tile exponents
+# (see Board.packedLines), holding the contribution of that line to
+# monotonicity, snakeMonotonicity, tileDiff and numEmpty. They are built
+# on first use, see buildLineTables and buildTileDiffTables.
+monotonicityTable = None
+snakeForwardTable = None
+snakeBackwardTable = None
+emptyTable = None
+tileDiffRowTables = None
+tileDiffColTables = None
+tileDiffOtherPairs = None
+
+# log2(value + 1) of the tile with exponent e, as used by monotonicity
+logPlusOneOfExp = [0.] + [math.log2(2 ** exp + 1) for exp in range(1, 16)]
+
+def monotonicityPenalty(prevVal, val):
+	"""Return the penalty for val following prevVal, if it breaks monotonicity."""
+	if val < prevVal:
+		return (prevVal - val) * prevVal
+	return 0
+
+def buildLineTables():
+	"""
+	Precompute the monotonicity, snake and empty square contributions of
+	every possible line.
+	"""
+	global monotonicityTable, snakeForwardTable, snakeBackwardTable, emptyTable
+	if monotonicityTable is not None:
+		return
+
+	monotonicity = [0.] * 65536
+	snakeForward = [0.] * 65536
+	snakeBackward = [0.] * 65536
+	empty = [0] * 65536
+	for code in range(65536):
+		exps = decodeRow(code)
+		logs = [logPlusOneOfExp[exp] for exp in exps]
+
+		diff = 0
+		prevVal = 0
+		for val in logs:
+			diff += monotonicityPenalty(prevVal, val)
+			prevVal = val
+		monotonicity[code] = diff
+
+		snakeForward[code] = sum(monotonicityPenalty(logs[k], logs[k + 1]) for k in range(3))
+		snakeBackward[code] = sum(monotonicityPenalty(logs[k + 1], logs[k]) for k in range(3))
+		empty[code] = exps.count(0)
+
+	monotonicityTable, snakeForwardTable, snakeBackwardTable, emptyTable = \
+		monotonicity, snakeForward, snakeBackward, empty
+
+def buildTileDiffTables(state):
+	"""
+	Precompute the tileDiff contributions of every possible line. The
+	neighbor pairs of state.getNeighbors that lie within a row or a
+	column go into per-row and per-column tables, the remaining
+	(diagonal) pairs are kept as a list of cell indices.
+	"""
+	global tileDiffRowTables, tileDiffColTables, tileDiffOtherPairs
+	if tileDiffRowTables is not None:
+		return
+
+	rowPairs = [[] for _ in range(4)]
+	colPairs = [[] for _ in range(4)]
+	otherPairs = []
+	for a, b in neighborPairs(state):
+		if a == b:
+			continue
+		(rowA, colA), (rowB, colB) = divmod(a, 4), divmod(b, 4)
+		if rowA == rowB:
+			rowPairs[rowA].append((colA, colB))
+		elif colA == colB:
+			colPairs[colA].append((rowA, rowB))
+		else:
+			otherPairs.append((a, b))
+
+	allExps = [decodeRow(code) for code in range(65536)]
+	tables = {}
+	def table(pairs):
+		# Lines with the same pairs share a table
+		pairs = tuple(sorted(pairs))
+		if pairs not in tables:
+			tables[pairs] = [sum(abs(exps[x] - exps[y]) for (x, y) in pairs) for exps in allExps]
+		return tables[pairs]
+
+	tileDiffRowTables = [table(pairs) for pairs in rowPairs]
+	tileDiffColTables = [table(pairs) for pairs in colPairs]
+	tileDiffOtherPairs = [(a >> 2, 4 * (a & 3), b >> 2, 4 * (b & 3)) for (a, b) in otherPairs]
+
+def monotonicityFromLines(rows, cols):
+	"""
+	Return monotonicity from the packed rows and columns, penalizing
+	rows closer to the max tile more.
+	"""
+	buildLineTables()
+	table = monotonicityTable
+	totalDiff = table[rows[0]] * 4 + table[rows[1]] * 3 + table[rows[2]] * 2 + table[rows[3]] + \
+		table[cols[1]] + table[cols[2]] * 2 + table[cols[3]] * 3
+	return -1 * totalDiff
+
+def snakeMonotonicityFromLines(rows):
+	"""
+	Return snakeMonotonicity from the packed rows: rows 0 and 2 are
+	walked left to right, rows 1 and 3 right to left.
+	"""
+	buildLineTables()
+	logs = logPlusOneOfExp
+	totalDiff = snakeForwardTable[rows[0]] + snakeBackwardTable[rows[1]] + \
+		snakeForwardTable[rows[2]] + snakeBackwardTable[rows[3]] + \
+		monotonicityPenalty(logs[rows[0] >> 12], logs[rows[1] >> 12]) + \
+		monotonicityPenalty(logs[rows[1] & 0xF], logs[rows[2] & 0xF]) + \
+		monotonicityPenalty(logs[rows[2] >> 12], logs[rows[3] >> 12])
+	return -1 * totalDiff
+
+def tileDiffFromLines(state, rows, cols):
+	"""
+	Return tileDiff from the packed rows and columns.
+	"""
+	buildTileDiffTables(state)
+	rowTables = tileDiffRowTables
+	colTables = tileDiffColTables
+	diff = rowTables[0][rows[0]] + rowTables[1][rows[1]] + rowTables[2][rows[2]] + rowTables[3][rows[3]] + \
+		colTables[0][cols[0]] + colTables[1][cols[1]] + colTables[2][cols[2]] + colTables[3][cols[3]]
+	for rowA, shiftA, rowB, shiftB in tileDiffOtherPairs:
+		diff += abs(((rows[rowA] >> shiftA) & 0xF) - ((rows[rowB] >> shiftB) & 0xF))
+	return -diff
+
+def numEmptyFromLines(rows):
+	"""
+	Return the number of empty squares from the packed rows.
+	"""
+	buildLineTables()
+	table = emptyTable
+	return table[rows[0]] + table[rows[1]] + table[rows[2]] + table[rows[3]]
+
+
+class BatchScan():
+	"""
+	The packed lines and derived arrays of N boards of size 4, from which
+	Evaluator.evaluateBatch computes every feature for all boards at once.
+	"""
+
+	def __init__(self, exps, scores):
+		buildArrayTables()
+		self.exps = exps
+		self.scores = scores
+		self.n = exps.shape[0]
+		grids = exps.reshape(-1, 4, 4)
+		self.rows = encodeRows(grids)
+		self.cols = encodeRows(grids.transpose(0, 2, 1))
+		self.maxExps = exps.max(axis=1).astype(np.int64)
+		self.maxIndex = exps.argmax(axis=1)
+
+	def score(self):
+		return self.scores.astype(np.float64)
+
+	def maxTile(self):
+		return np.where(self.maxExps > 0, np.left_shift(1, self.maxExps), 0)
+
+	def numEmpty(self):
+		return (self.exps == 0).sum(axis=1)
+
+	def maxTileCorner(self):
+		dist = np.abs(3 - self.maxIndex // 4) + np.abs(3 - self.maxIndex % 4)
+		return -1. * dist
+
+	def tileDiff(self):
+		tables = arrayTables
+		rows, cols = self.rows, self.cols
+		diff = np.zeros(self.n, dtype=np.int64)
+		for k in range(4):
+			diff += tables["tileDiffRows"][k][rows[:, k]]
+			diff += tables["tileDiffCols"][k][cols[:, k]]
+		exps = self.exps.astype(np.int64)
+		diff += np.abs(exps[:, tables["otherPairsA"]] - exps[:, tables["otherPairsB"]]).sum(axis=1)
+		return -diff
+
+	def monotonicity(self):
+		table = arrayTables["monotonicity"]
+		rows, cols = self.rows, self.cols
+		totalDiff = table[rows[:, 0]] * 4 + table[rows[:, 1]] * 3 + table[rows[:, 2]] * 2 + table[rows[:, 3]] + \
+			table[cols[:, 1]] + table[cols[:, 2]] * 2 + table[cols[:, 3]] * 3
+		return -1 * totalDiff
+
+	def snakeMonotonicity(self):
+		tables = arrayTables
+		rows = self.rows
+		logs = tables["logPlusOneOfExp"][self.exps]
+
+		def penalty(prevVal, val):
+			return np.where(val < prevVal, (prevVal - val) * prevVal, 0.)
+
+		totalDiff = tables["snakeForward"][rows[:, 0]] + tables["snakeBackward"][rows[:, 1]] + \
+			tables["snakeForward"][rows[:, 2]] + tables["snakeBackward"][rows[:, 3]] + \
+			penalty(logs[:, 3], logs[:, 7]) + penalty(logs[:, 4], logs[:, 8]) + \
+			penalty(logs[:, 11], logs[:, 15])
+		return -1 * totalDiff
+
+	def snakeMonotonicityGeometric(self):
+		values = np.where(self.exps > 0, np.left_shift(1, self.exps.astype(np.int64)), 0)
+		return values[:, arrayTables["snakeOrder"]] @ (0.25 ** np.arange(16))
+
+	def logScore(self):
+		return np.log2(np.maximum(self.scores, 1))
+
+	def fullMaxRow(self):
+		grids = self.exps.reshape(-1, 4, 4)
+		maxRows = grids[np.arange(self.n), self.maxIndex // 4]
+		return -1 * (maxRows == 0).sum(axis=1)
+
+
+# NumPy versions of the line tables, used by BatchScan
+arrayTables = None
+
+def buildArrayTables():
+	"""
+	Convert the line tables into NumPy arrays.
+	"""
+	global arrayTables
+	if arrayTables is not None:
+		return
+
+	# The tileDiff neighbor pairs are defined by Board.getNeighbors
+	from gameObjects import Board
+	buildLineTables()
+	buildTileDiffTables(Board(size=4, config=[[0] * 4 for _ in range(4)]))
+
+	arrayTables = {
+		"monotonicity": np.array(monotonicityTable),
+		"snakeForward": np.array(snakeForwardTable),
+		"snakeBackward": np.array(snakeBackwardTable),
+		"logPlusOneOfExp": np.array(logPlusOneOfExp),
+		"tileDiffRows": [np.array(table, dtype=np.int64) for table in tileDiffRowTables],
+		"tileDiffCols": [np.array(table, dtype=np.int64) for table in tileDiffColTables],
+		"otherPairsA": np.array([rowA * 4 + shiftA // 4 for (rowA, shiftA, _, _) in tileDiffOtherPairs], dtype=np.int64),
+		"otherPairsB": np.array([rowB * 4 + shiftB // 4 for (_, _, rowB, shiftB) in tileDiffOtherPairs], dtype=np.int64),
+		"snakeOrder": np.array([row * 4 + (i if row % 2 == 0 else 3 - i) for row in range(4) for i in range(4)]),
+	}
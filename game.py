@@ -7,40 +7,55 @@
 
 # Import game objects
 from gameObjects import *
-# Import expectimax and random agents
-from agents import *
-# Import Q-Learning agents
-from qLearningAgents import *
+from bitBoard import BitBoard
+# Import the registry of all agents
+from agentRegistry import createAgent
 
 from logger import *
-from boardView import *
-from pygame import *
 
 import time
 import sys
 import os
-import tqdm
+import numpy as np
+from collections import Counter
+from multiprocessing import Pool
 
 class Game():
 	"""A 2048 game."""
 
-	def __init__(self, agent, depth=None, graphics=False, trials=1, dim=4, delayLength=0.1, webview=False):
-		"""Initialize a new game."""
+	def __init__(self, agent, depth=None, graphics=False, trials=1, dim=4, delayLength=0.1, webview=False,
+				 bitboard=False, agentOptions=None, firstTrial=0, logSuffix="", progress=True, seed=None):
+		"""Initialize a new game.
+		agentOptions = additional keyword arguments for the agent
+		seed = master seed of the random tiles and agent choices of all
+			trials (see trialRngs), a fresh one by default
+		firstTrial = number of the first trial, in the log and the results
+		logSuffix = text appended to the name of the log file
+		progress = show a progress bar over the trials
+		"""
 
 		self.graphics = graphics
 		self.trials = trials
+		self.firstTrial = firstTrial
+		self.progress = progress
 		self.dim = dim
+		self.seed = np.random.SeedSequence(seed).entropy
 		
 		# Instantiate agent
-		if depth is None or agent == "MonteCarloAgent" or agent == "QLearningAgent":
-			self.agent = eval(agent)()
-		else:
-			self.agent = eval(agent)(depth=depth)
+		if agentOptions is None:
+			agentOptions = {}
+		self.agent = createAgent(agent, depth=depth, **agentOptions)
 		# Instantiate board
-		self.board = Board(size=dim)
+		self.boardClass = BitBoard if bitboard else Board
+		self.board = self.boardClass(size=dim)
 		# Create Log File for agent
-		self.logName = beginLog(self.board)
+		self.logName = beginLog(self.board, logSuffix)
 		if self.graphics:
+			# pygame is only loaded for graphics, keeping headless runs
+			# and worker processes light
+			import pygame
+			from boardView import BoardView
+			self.pygame = pygame
 			# Create a board view instance
 			self.view = BoardView(size=dim)
 			self.delay = delayLength
@@ -52,15 +67,53 @@ class Game():
 
 
 	def run(self):
-		"""Plays the specified number of games with the agent."""
+		"""Plays the specified number of games with the agent and returns
+		the results of the trials (see playTrials)."""
+
+		Board.resetCacheStats()
+		try:
+			results = self.playTrials()
+		finally:
+			# Stop worker processes of the agent
+			self.agent.close()
+
+		# Report how well the agent's caches worked
+		for name, stats in self.agent.cacheStats().items():
+			print("{}: {}".format(name, stats))
+		# and how often the derived values of the boards were reused
+		if isinstance(self.board, Board):
+			print("boardCaches: {}".format(Board.cacheStats()))
+
+		# show replay
+		if self.webview:
+			os.system("python replay.py {}".format(self.logName))
+
+		if self.graphics:
+			self.pygame.quit()
+
+		return results
 
+	def playTrials(self):
+		"""Plays the games of the run, one after another, and returns a
+		list with the score, maximum tile, number of moves and decision
+		times of each trial."""
+
+		results = []
 		# Play certain number of trials
-		for trial in tqdm.trange(self.trials):
+		trials = range(self.firstTrial, self.firstTrial + self.trials)
+		if self.progress:
+			import tqdm
+			trials = tqdm.tqdm(trials)
+		for trial in trials:
+			# Initialize new board, with the random streams of this trial
+			tileRng, self.agent.rng = trialRngs(self.seed, trial)
+			self.board = self.boardClass(size=self.dim, rng=tileRng)
+			decisionTimes = []
 			while True:
 				if self.graphics:
 					# Create grid of squares
 					self.view.render(self.board)
-					pygame.display.update()
+					self.pygame.display.update()
 
 				if self.board.isGameOver():
 					if type(self.agent).__name__ == "QLearningAgent":
@@ -71,6 +124,7 @@ class Game():
 					self.agent.addScore(self.board.score)
 					self.agent.addMaxTile(self.board.maxTile())
 					log(self.logName, self.board, decisionTime, self.agent, "N/A", trial)
+					results.append(trialResult(trial, self.board, decisionTimes))
 					break
 
 				beginTime = time.time()
@@ -78,6 +132,7 @@ class Game():
 				endTime = time.time()
 
 				decisionTime = endTime - beginTime
+				decisionTimes.append(decisionTime)
 
 				# Log state
 				log(self.logName, self.board, decisionTime, self.agent, move, trial)
@@ -86,18 +141,96 @@ class Game():
 				time.sleep(self.delay)
 
 				if self.graphics:
+					pygame = self.pygame
 					events = pygame.event.get()
 					for e in events:
-						if e.type == QUIT or (e.type == KEYUP and e.key == K_ESCAPE):
+						if e.type == pygame.QUIT or (e.type == pygame.KEYUP and e.key == pygame.K_ESCAPE):
 							pygame.quit()
 							sys.exit("Leaving because you requested it.")
 
-			# Initialize new board
-			self.board.initBoard()
-
-		# show replay
-		if self.webview:
-			os.system("python replay.py {}".format(self.logName))
-
-		if self.graphics:
-			pygame.quit()
+		return results
+
+
+def trialRngs(seed, trial):
+	"""Returns the generators of the random tiles and of the agent in a
+	trial. They only depend on the master seed and the number of the
+	trial, so a trial plays the same whether it runs alone, after other
+	trials or in a worker process of runParallel."""
+	tileSeed, agentSeed = np.random.SeedSequence(seed, spawn_key=(trial,)).spawn(2)
+	return np.random.default_rng(tileSeed), np.random.default_rng(agentSeed)
+
+
+def trialResult(trial, board, decisionTimes):
+	"""Returns the result of a finished trial as a dict."""
+	moves = len(decisionTimes)
+	totalTime = sum(decisionTimes)
+	return {"trial": trial,
+			"score": board.score,
+			"maxTile": board.maxTile(),
+			"moves": moves,
+			"totalDecisionTime": totalTime,
+			"meanDecisionTime": totalTime / moves if moves else 0.,
+			"maxDecisionTime": max(decisionTimes) if decisionTimes else 0.}
+
+
+def playShard(shard):
+	"""Plays one shard of the trials of runParallel in a worker process
+	and returns its results."""
+	agent, depth, trials, dim, bitboard, agentOptions, seed, index, firstTrial = shard
+	game = Game(agent, depth=depth, graphics=False, trials=trials, dim=dim, bitboard=bitboard,
+				agentOptions=agentOptions, firstTrial=firstTrial, logSuffix="-shard{}".format(index),
+				progress=False, seed=seed)
+	return game.run()
+
+
+def runParallel(agent, depth=None, trials=1, dim=4, bitboard=False, agentOptions=None, processes=2,
+				seed=None):
+	"""
+	Plays the trials headless, split evenly over the given number of
+	worker processes, each writing its own log file. Every trial draws
+	from the streams of trialRngs, so the results equal those of a
+	serial Game with the same seed. Returns the results of all trials,
+	in order.
+	"""
+	processes = max(1, min(processes, trials))
+	seed = np.random.SeedSequence(seed).entropy
+	shards = []
+	firstTrial = 0
+	for index in range(processes):
+		shardTrials = trials // processes + (1 if index < trials % processes else 0)
+		shards.append((agent, depth, shardTrials, dim, bitboard, agentOptions, seed, index, firstTrial))
+		firstTrial += shardTrials
+
+	pool = Pool(processes=processes)
+	try:
+		results = [result for shardResults in pool.map(playShard, shards, chunksize=1)
+				   for result in shardResults]
+	finally:
+		pool.close()
+		pool.join()
+	return sorted(results, key=lambda result: result["trial"])
+
+
+def summarizeResults(results):
+	"""Merges the results of the trials into one summary dict."""
+	scores = np.array([result["score"] for result in results], dtype=np.float64)
+	moves = sum(result["moves"] for result in results)
+	totalTime = sum(result["totalDecisionTime"] for result in results)
+	return {"trials": len(results),
+			"meanScore": scores.mean() if len(results) else 0.,
+			"medianScore": float(np.median(scores)) if len(results) else 0.,
+			"maxScore": scores.max() if len(results) else 0.,
+			"maxTiles": dict(sorted(Counter(result["maxTile"] for result in results).items())),
+			"moves": moves,
+			"meanDecisionTime": totalTime / moves if moves else 0.,
+			"maxDecisionTime": max([result["maxDecisionTime"] for result in results] or [0.])}
+
+
+def printSummary(summary):
+	"""Prints a summary made by summarizeResults."""
+	print("Trials: {}".format(summary["trials"]))
+	print("Score: mean {:.1f}, median {:.1f}, max {:.0f}".format(
+		summary["meanScore"], summary["medianScore"], summary["maxScore"]))
+	print("Max tiles: " + ", ".join("{}: {}".format(tile, count) for tile, count in summary["maxTiles"].items()))
+	print("Moves: {}, decision time: mean {:.2f}ms, max {:.2f}ms".format(
+		summary["moves"], 1000 * summary["meanDecisionTime"], 1000 * summary["maxDecisionTime"]))
@@ -6,35 +6,81 @@
 # and contains methods that execute actions in the game, such as
 # performing tile shifts.
 
-import copy
 import numpy as np
+from array import array
+from enum import IntEnum
+
+class Move(IntEnum):
+	"""
+	Integer codes of the moves. Board methods also accept the move names
+	("LEFT", ...), which are used in logs.
+	"""
+	LEFT = 0
+	RIGHT = 1
+	UP = 2
+	DOWN = 3
+
+# Move codes indexed by move code or by move name
+MOVE_CODES = dict([(move, move) for move in Move] + [(move.name, move) for move in Move])
+
+def moveName(move):
+	"""
+	Return the name of a move, as written to logs and shown to the user.
+	Other values, such as strings, are returned as text.
+	"""
+	if isinstance(move, Move):
+		return move.name
+	return str(move)
 
 class Board():
 
-	def __init__(self, size=4, config=None):
+	# All state lives in these slots; constants are class attributes
+	__slots__ = ("size", "cells", "score", "mostRecentRandomTilePos", "rng",
+				 "emptyCache", "movesCache", "maxCache", "linesCache", "gridCache")
 
-		self.config = config
+	LEFT = Move.LEFT
+	RIGHT = Move.RIGHT
+	UP = Move.UP
+	DOWN = Move.DOWN
 
-		self.size = size
-		self.prob2 = .9
-		self.prob4 = 1 - self.prob2
+	prob2 = .9
+	prob4 = 1 - prob2
+
+	# Number of times a derived value (empty squares, valid moves, max tile)
+	# was served from the per-state cache, and number of times the grid had
+	# to be rescanned for it. See resetCacheStats.
+	rescansAvoided = {"emptySquares": 0, "validMoves": 0, "maxTile": 0}
+	rescans = {"emptySquares": 0, "validMoves": 0, "maxTile": 0}
+
+	def __init__(self, size=4, config=None, rng=None):
+		"""
+		Initialize a board, from a list of rows of tile values if config
+		is given, or else with random tiles.
+		rng = np.random.Generator drawing the random tiles, shared with
+			copies and successors of the board (a new unseeded one by default)
+		"""
 
-		self.LEFT = "LEFT"
-		self.RIGHT = "RIGHT"
-		self.UP = "UP"
-		self.DOWN = "DOWN"
+		self.size = size
+		self.rng = rng if rng is not None else np.random.default_rng()
 
-		self.grid = [[0] * x for x in [size] * size ]
+		# Tile exponents (0 = empty, 1 = 2, 2 = 4, ...) in row-major
+		# order, one byte each. Tile values are only derived for the grid view.
+		self.cells = array('B', bytes(size * size))
 		self.score = 0
 
+		# Values derived from the cells, computed lazily once per state.
+		# They are reset by every method that changes the cells; code that
+		# writes to self.cells directly must call invalidate.
+		self.invalidate()
+
 		# The position at which the most recent random tile has been inserted
 		self.mostRecentRandomTilePos = None
 
 		if config is not None:
-			self.grid = copy.deepcopy(config)
+			self.grid = config
 		else:
 			# Initialize random grid with either 1, 2 or 3 blocks
-			numberStart = np.random.randint(1, 4)
+			numberStart = self.rng.integers(1, 4)
 			self.placeRandomTile(numberStart)
 
 	def __str__(self):
@@ -47,65 +93,196 @@ class Board():
 		return totString
 
 	def copy(self):
-		newBoard = Board(size=self.size, config=self.config)
-
-		for i in range(newBoard.size):
-			row = []
-			for j in range(newBoard.size):
-				row.append(self.grid[i][j])
-			newBoard.grid[i] = row
-
+		# Bypass __init__, which would place random tiles that are
+		# immediately overwritten. The cached values are shared, as
+		# they are replaced rather than changed.
+		newBoard = Board.__new__(Board)
+		newBoard.size = self.size
+		newBoard.cells = self.cells[:]
 		newBoard.score = self.score
 		newBoard.mostRecentRandomTilePos = self.mostRecentRandomTilePos
+		newBoard.rng = self.rng
+		newBoard.emptyCache = self.emptyCache
+		newBoard.movesCache = self.movesCache
+		newBoard.maxCache = self.maxCache
+		newBoard.linesCache = self.linesCache
+		newBoard.gridCache = self.gridCache
 
 		return newBoard
 
+	@property
+	def grid(self):
+		"""
+		Return the board as a list of rows of tile values. The result is
+		cached until the board changes and must not be mutated; assign
+		a new list of rows to grid to change the board instead.
+		"""
+		if self.gridCache is None:
+			size = self.size
+			values = [1 << exp if exp != 0 else 0 for exp in self.cells]
+			self.gridCache = [values[i * size:(i + 1) * size] for i in range(size)]
+		return self.gridCache
+
+	@grid.setter
+	def grid(self, grid):
+		self.cells = array('B', [int(val).bit_length() - 1 if val != 0 else 0 for row in grid for val in row])
+		self.invalidate()
+
+	def key(self):
+		"""
+		Return a hashable representation of the board state, used to
+		look up positions in caches.
+		"""
+		return (self.cells.tobytes(), self.score)
+
+	def canonicalKey(self):
+		"""
+		Return the smallest key among the 8 rotations and reflections of
+		the board, and the transform that maps the board onto it (see
+		transformGrid). Boards of size 4 are keyed by their packed rows,
+		so that the keys match those of BitBoard.
+		"""
+		lines = self.packedLines()
+		if lines is not None:
+			lines, transform = canonicalLines(*lines)
+			return (lines, self.score), transform
+
+		rows = tuple(map(tuple, self.grid))
+		bestGrid = None
+		bestTransform = 0
+		for base, transposed in ((rows, 0), (tuple(zip(*rows)), 4)):
+			mirrored = tuple(row[::-1] for row in base)
+			for grid, transform in ((base, transposed), (mirrored, transposed | 1),
+									(base[::-1], transposed | 2), (mirrored[::-1], transposed | 3)):
+				if bestGrid is None or grid < bestGrid:
+					bestGrid = grid
+					bestTransform = transform
+		return (bestGrid, self.score), bestTransform
+
+	def packedLines(self):
+		"""
+		Return the rows and the columns of a board of size 4 as two lists
+		of 16-bit integers, holding the exponent of the tile in column
+		(or row) k in bits 4k..4k+3. Return None for other sizes or
+		for tiles above 32768, which do not fit into four bits.
+		"""
+		if self.linesCache is None:
+			if self.size != 4 or self.maxTile() > 32768:
+				return None
+			c = self.cells
+			rows = [c[k] | (c[k + 1] << 4) | (c[k + 2] << 8) | (c[k + 3] << 12) for k in (0, 4, 8, 12)]
+			cols = [c[k] | (c[k + 4] << 4) | (c[k + 8] << 8) | (c[k + 12] << 12) for k in (0, 1, 2, 3)]
+			self.linesCache = (rows, cols)
+		return self.linesCache
+
+	def exponents(self):
+		"""
+		Return the tile exponents (0 = empty, 1 = 2, 2 = 4, ...) of the
+		board as a flat array('B') in row-major order. The array is the
+		storage of the board and must not be mutated.
+		"""
+		return self.cells
+
 	def initBoard(self):
-		self.grid = [[0] * x for x in [self.size] * self.size ]
+		self.cells = array('B', bytes(self.size * self.size))
 		self.score = 0
+		self.invalidate()
 
-		numberStart = np.random.randint(1, 4)
+		numberStart = self.rng.integers(1, 4)
 		self.placeRandomTile(numberStart)
 
+	def invalidate(self):
+		"""
+		Discard the cached values derived from the cells.
+		"""
+		self.gridCache = None
+		self.emptyCache = None
+		self.movesCache = None
+		self.maxCache = None
+		self.linesCache = None
+
+	@staticmethod
+	def resetCacheStats():
+		"""
+		Reset the counters of cached and rescanned derived values.
+		"""
+		for key in Board.rescans:
+			Board.rescans[key] = 0
+			Board.rescansAvoided[key] = 0
+
+	@staticmethod
+	def cacheStats():
+		"""
+		Return, for each derived value, the number of scans of the grid
+		and the number of scans avoided by the cache, in this process.
+		"""
+		return dict((key, {"scans": Board.rescans[key], "avoided": Board.rescansAvoided[key]})
+					for key in Board.rescans)
+
 	def emptySquares(self):
 		"""
 		Return a list of coordinates tuples of empty squares.
+		The list is shared with the cache and must not be mutated.
 		"""
-		res = []
-		for i in range(self.size):
-			for j in range(self.size):
-				if self.grid[i][j] == 0:
-					res.append((i, j))
-		return res
+		if self.emptyCache is None:
+			Board.rescans["emptySquares"] += 1
+			self.emptyCache = self.scanEmptySquares()
+		else:
+			Board.rescansAvoided["emptySquares"] += 1
+		return self.emptyCache
+
+	def scanEmptySquares(self):
+		"""
+		Scan the cells for empty squares.
+		"""
+		size = self.size
+		return [(k // size, k % size) for k, exp in enumerate(self.cells) if exp == 0]
 
 	def validMoves(self):
 		"""
 		Return a list of valid moves.
+		The list is shared with the cache and must not be mutated.
 		"""
-		moves = set([])
+		if self.movesCache is None:
+			Board.rescans["validMoves"] += 1
+			self.movesCache = self.scanValidMoves()
+		else:
+			Board.rescansAvoided["validMoves"] += 1
+		return self.movesCache
 
-		for i in range(self.size):
-			for j in range(self.size):
+	def scanValidMoves(self):
+		"""
+		Scan the cells for valid moves.
+		"""
+		moves = set([])
+		size = self.size
+		cells = self.cells
+
+		for i in range(size):
+			for j in range(size):
+				exp = cells[i * size + j]
+				if exp == 0:
+					continue
 				# Check if Left is valid
 				if j >= 1:
-					if (self.grid[i][j] == self.grid[i][j-1] and self.grid[i][j] != 0) or \
-					   (self.grid[i][j] > 0 and self.grid[i][j-1] == 0):
-				   		moves.add(self.LEFT)
+					other = cells[i * size + j - 1]
+					if other == exp or other == 0:
+						moves.add(self.LEFT)
 				# Check if Right is valid
-				if j <= self.size - 2:
-					if (self.grid[i][j] == self.grid[i][j+1] and self.grid[i][j] != 0) or \
-				   	   (self.grid[i][j] > 0 and self.grid[i][j+1] == 0):
-				   		moves.add(self.RIGHT)
+				if j <= size - 2:
+					other = cells[i * size + j + 1]
+					if other == exp or other == 0:
+						moves.add(self.RIGHT)
 				# Check if Up is valid
 				if i >= 1:
-					if (self.grid[i][j] == self.grid[i-1][j] and self.grid[i][j] != 0) or \
-				   	   (self.grid[i][j] > 0 and self.grid[i-1][j] == 0):
-				   		moves.add(self.UP)
+					other = cells[(i - 1) * size + j]
+					if other == exp or other == 0:
+						moves.add(self.UP)
 				# Check if Down is valid
-				if i < self.size - 1:
-					if (self.grid[i][j] == self.grid[i+1][j] and self.grid[i][j] != 0) or \
-				   	   (self.grid[i][j] > 0 and self.grid[i+1][j] == 0):
-				   		moves.add(self.DOWN)
+				if i < size - 1:
+					other = cells[(i + 1) * size + j]
+					if other == exp or other == 0:
+						moves.add(self.DOWN)
 
 				# Check if all moves are valid to terminate early
 				if len(moves) == 4:
@@ -122,10 +299,10 @@ class Board():
 
 		def shiftRow(vals):
 			"""
-			Shift values within a row to the left.  Will move a value to
+			Shift exponents within a row to the left.  Will move a tile to
 			the left until it hits another block.  If that block
 			has the same value, then the value is doubled.  Otherwise we
-			stop shifting the value left.
+			stop shifting the tile left.
 			"""
 			newValue = 0
 			possibleMerge = [True] * len(vals)
@@ -143,9 +320,9 @@ class Board():
 						elif vals[temp - 1] == val:
 							# check if mergeable
 							if possibleMerge[temp - 1]:
-								vals[temp - 1] = 2 * val
+								vals[temp - 1] = val + 1
 								vals[temp] = 0
-								newValue += 2 * val
+								newValue += 1 << (val + 1)
 								possibleMerge[temp - 1] = False
 								break
 							else:
@@ -155,98 +332,135 @@ class Board():
 						temp -= 1
 			return vals, newValue
 
+		move = MOVE_CODES.get(move)
+		size = self.size
+		cells = self.cells
+
 		if move == self.LEFT:
-			for i in range(self.size):
+			for i in range(size):
 				# move each row to the left
-				self.grid[i], newVal = shiftRow(self.grid[i])
+				row, newVal = shiftRow(cells[i * size:(i + 1) * size])
+				cells[i * size:(i + 1) * size] = row
 				self.score += newVal
 
 		elif move == self.RIGHT:
-			for i in range(self.size):
+			for i in range(size):
 				# move each row to the right
-				row = list(reversed(self.grid[i]))
-				revRow, newVal = shiftRow(row)
-				self.grid[i] = list(reversed(revRow))
+				row, newVal = shiftRow(cells[i * size:(i + 1) * size][::-1])
+				cells[i * size:(i + 1) * size] = row[::-1]
 				self.score += newVal
 
 		elif move == self.DOWN:
-			for j in range(self.size):
-				col = list(reversed([row[j] for row in self.grid]))
-				col, newVal = shiftRow(col)
-				col = list(reversed(col))
+			for j in range(size):
+				col, newVal = shiftRow(cells[j::size][::-1])
+				cells[j::size] = col[::-1]
 				self.score += newVal
-				for i, row in enumerate(self.grid):
-					row[j] = col[i]
 
 		elif move == self.UP:
-			for j in range(self.size):
-				col = [row[j] for row in self.grid]
-				col, newVal = shiftRow(col)
+			for j in range(size):
+				col, newVal = shiftRow(cells[j::size])
+				cells[j::size] = col
 				self.score += newVal
-				for i, row in enumerate(self.grid):
-					row[j] = col[i]
 
 		else:
 			raise ValueError("Invalid move: Only UP, LEFT, BOTTOM, RIGHT \
 are permitted.")
 
+		self.invalidate()
+
+	def makeMove(self, move):
+		"""
+		Shift the board in place according to move and return an undo
+		record, which unmakeMove uses to restore the previous state.
+		This allows searches to walk the game tree on a single board.
+		"""
+		undo = (self.cells[:], self.score, self.mostRecentRandomTilePos,
+				self.emptyCache, self.movesCache, self.maxCache, self.linesCache)
+		self.shift(move)
+		return undo
+
+	def unmakeMove(self, undo):
+		"""
+		Restore the state saved by makeMove.
+		"""
+		self.cells, self.score, self.mostRecentRandomTilePos, \
+			self.emptyCache, self.movesCache, self.maxCache, self.linesCache = undo
+		self.gridCache = None
+
 	def placeRandomTile(self, num):
 		"""
 		Add num new tiles to random empty squares of the board.
 		"""
 
 		emptySquares = self.emptySquares()
-		locations = np.random.choice(range(len(emptySquares)),
-									size=num, replace=False)
+		locations = self.rng.choice(len(emptySquares), size=num, replace=False)
 		for k in locations:
 			i, j = emptySquares[k]
-			choice = np.random.random()
+			choice = self.rng.random()
 			if choice > 1 - self.prob2:
-				self.grid[i][j] = 2
+				self.cells[i * self.size + j] = 1
 			else:
-				self.grid[i][j] = 4
+				self.cells[i * self.size + j] = 2
 			self.mostRecentRandomTilePos = (i, j)
+		self.invalidate()
 
 	def isGameOver(self):
 		"""
 		Return True if the game is over, False otherwise.
+		Stops at the first empty square or pair of equal neighbors,
+		without building the list of valid moves.
 		"""
-
-		moves = self.validMoves()
-		if len(moves) == 0:
-			return True
-		else:
-			return False
+		if self.movesCache is not None:
+			return len(self.movesCache) == 0
+
+		cells = self.cells
+		if 0 in cells:
+			# A tile can move into an empty square, unless there is no tile
+			return not any(cells)
+
+		size = self.size
+		for i in range(size):
+			for j in range(size):
+				exp = cells[i * size + j]
+				if j < size - 1 and cells[i * size + j + 1] == exp:
+					return False
+				if i < size - 1 and cells[(i + 1) * size + j] == exp:
+					return False
+		return True
 
 	def maxTile(self):
 		"""
 		Return the value of the tile with the highest value.
 		"""
-
-		# iterate over all tiles in the board
-		maxT = 0
-		for i in range(self.size):
-			for j in range(self.size):
-				val = self.grid[i][j]
-				if val > maxT:
-					maxT = val
-		return maxT
+		return self.cachedMaxTile()[0]
 
 	def maxTilePosition(self):
 		"""
 		Return position of maxTile.
 		"""
-		maxT = 0
-		bestI = None
-		bestJ = None
-		for i in range(self.size):
-			for j in range(self.size):
-				val = self.grid[i][j]
-				if val > maxT:
-					maxT = val
-					bestI = i
-					bestJ = j
-		return (bestI, bestJ)
+		return self.cachedMaxTile()[1]
+
+	def cachedMaxTile(self):
+		"""
+		Return the value and position of maxTile, scanning the grid
+		only once per state.
+		"""
+		if self.maxCache is None:
+			Board.rescans["maxTile"] += 1
+			self.maxCache = self.scanMaxTile()
+		else:
+			Board.rescansAvoided["maxTile"] += 1
+		return self.maxCache
+
+	def scanMaxTile(self):
+		"""
+		Scan the cells for the value and position of maxTile.
+		"""
+		maxExp = max(self.cells)
+		if maxExp == 0:
+			return 0, (None, None)
+		index = self.cells.index(maxExp)
+		return 1 << maxExp, (index // self.size, index % self.size)
 
 	def getNeighbors(self, pos):
 		"""
@@ -286,22 +500,30 @@ are permitted.")
 		Place a tile with a given value at position i,j on the board.
 		"""
 
-		# ensure proper usage
-		if self.grid[i][j] != 0:
-			raise ValueError("Tried to place a tile in a non-empty square.")
-
 		if i >= self.size or j >= self.size:
 			raise ValueError("Invalid tile position.")
 
+		# ensure proper usage
+		if self.cells[i * self.size + j] != 0:
+			raise ValueError("Tried to place a tile in a non-empty square.")
+
 		# place the new tile in the grid
-		self.grid[i][j] = val
+		self.cells[i * self.size + j] = int(val).bit_length() - 1
+		self.invalidate()
+
+	def removeTile(self, i, j):
+		"""
+		Remove the tile at position i,j, undoing placeTile.
+		"""
+		self.cells[i * self.size + j] = 0
+		self.invalidate()
 
 	def getSuccessor(self, move, printOpts=True):
 		"""
 		Return a random successor board.
 		"""
 		successor = self.copy()
-		if move in successor.validMoves():
+		if MOVE_CODES.get(move) in successor.validMoves():
 			successor.shift(move)
 			successor.placeRandomTile(1)
 		if printOpts:
@@ -309,6 +531,33 @@ are permitted.")
 		return successor
 
 
+	def iterSuccessors(self, move):
+		"""
+		Yield the possible successor states of move and their associated
+		probabilities, one at a time. The successors are generated in place:
+		the board itself is shifted and receives each random tile in turn,
+		so a yielded board must be copied to be kept. The board is restored
+		when the generator is exhausted or closed.
+		"""
+
+		# make sure that the move is valid
+		move = MOVE_CODES.get(move)
+		if move not in self.validMoves():
+			return
+
+		undo = self.makeMove(move)
+		try:
+			emptyIndices = self.emptySquares()
+			prob2 = self.prob2 * 1. / len(emptyIndices)
+			prob4 = self.prob4 * 1. / len(emptyIndices)
+			for i, j in emptyIndices:
+				for val, prob in ((2, prob2), (4, prob4)):
+					self.placeTile(i, j, val)
+					yield self, prob
+					self.removeTile(i, j)
+		finally:
+			self.unmakeMove(undo)
+
 	def getAllSuccessors(self, move):
 		"""
 		Return the possible successor states and their associated
@@ -317,31 +566,96 @@ are permitted.")
 
 		statesList = []
 		probsList = []
+		for successor, prob in self.iterSuccessors(move):
+			statesList.append(successor.copy())
+			probsList.append(prob)
 
-		# make sure that the move is valid
-		if move not in self.validMoves():
+		# the move is invalid
+		if not statesList:
 			return []
 
-		duplicate = self.copy()
-
-		duplicate.shift(move)
-
-		emptyIndices = duplicate.emptySquares()
-		numEmptyInd = len(emptyIndices)
-		for empty in emptyIndices:
-			child2 = duplicate.copy()
-			child2.placeTile(empty[0], empty[1], 2)
-			statesList.append(child2)
-			probsList.append(self.prob2 * 1. / numEmptyInd)
-
-			child4 = duplicate.copy()
-			child4.placeTile(empty[0], empty[1], 4)
-			statesList.append(child4)
-			probsList.append(self.prob4 * 1. / numEmptyInd)
-
 		return (statesList, probsList)
 
 	def manhattanDistance(self, pos1, pos2):
 		x1, y1 = pos1
 		x2, y2 = pos2
 		return np.abs((x2 - x1)) + np.abs((y2 - y1))
+
+
+# Moves swapped by each of the elementary symmetries of the board
+TRANSPOSED_MOVES = {Move.LEFT: Move.UP, Move.UP: Move.LEFT, Move.RIGHT: Move.DOWN, Move.DOWN: Move.RIGHT}
+MIRRORED_MOVES = {Move.LEFT: Move.RIGHT, Move.RIGHT: Move.LEFT, Move.UP: Move.UP, Move.DOWN: Move.DOWN}
+FLIPPED_MOVES = {Move.LEFT: Move.LEFT, Move.RIGHT: Move.RIGHT, Move.UP: Move.DOWN, Move.DOWN: Move.UP}
+
+# Row of packed exponents with its tiles in reverse order, indexed by
+# the packed row. Built on first use, see canonicalLines.
+reverseRowTable = None
+
+def canonicalLines(rows, cols):
+	"""
+	Return the smallest tuple of packed rows among the 8 rotations and
+	reflections of a board of size 4 given by its packed rows and columns
+	(see Board.packedLines), and the transform leading to it.
+	"""
+	global reverseRowTable
+	if reverseRowTable is None:
+		reverseRowTable = [((row & 0xF) << 12) | (((row >> 4) & 0xF) << 8) |
+						   (((row >> 8) & 0xF) << 4) | (row >> 12) for row in range(65536)]
+	rev = reverseRowTable
+
+	bestLines = None
+	bestTransform = 0
+	for (l0, l1, l2, l3), transposed in ((rows, 0), (cols, 4)):
+		mirrored = (rev[l0], rev[l1], rev[l2], rev[l3])
+		for lines, transform in (((l0, l1, l2, l3), transposed), (mirrored, transposed | 1),
+								 ((l3, l2, l1, l0), transposed | 2), (mirrored[::-1], transposed | 3)):
+			if bestLines is None or lines < bestLines:
+				bestLines = lines
+				bestTransform = transform
+	return bestLines, bestTransform
+
+def transformGrid(grid, transform):
+	"""
+	Return a copy of grid under one of the 8 symmetries of the square,
+	numbered 0..7: bit 2 transposes the grid first, then bit 0 mirrors
+	the columns and bit 1 flips the rows.
+	"""
+	if transform & 4:
+		grid = [list(col) for col in zip(*grid)]
+	if transform & 1:
+		grid = [row[::-1] for row in grid]
+	if transform & 2:
+		grid = grid[::-1]
+	return [list(row) for row in grid]
+
+def transformMove(move, transform):
+	"""
+	Return the move on the transformed board which corresponds to move
+	on the original board.
+	"""
+	if move is None:
+		return None
+	move = MOVE_CODES[move]
+	if transform & 4:
+		move = TRANSPOSED_MOVES[move]
+	if transform & 1:
+		move = MIRRORED_MOVES[move]
+	if transform & 2:
+		move = FLIPPED_MOVES[move]
+	return move
+
+def inverseTransformMove(move, transform):
+	"""
+	Return the move on the original board which corresponds to move
+	on the transformed board, undoing transformMove.
+	"""
+	if move is None:
+		return None
+	move = MOVE_CODES[move]
+	if transform & 2:
+		move = FLIPPED_MOVES[move]
+	if transform & 1:
+		move = MIRRORED_MOVES[move]
+	if transform & 4:
+		move = TRANSPOSED_MOVES[move]
+	return move
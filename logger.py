@@ -7,17 +7,17 @@
 from gameObjects import *
 import datetime
 
-def beginLog(state):
+def beginLog(state, suffix=""):
 	"""
-	Creates a .csv file to write data to.  The headers
-	will be the following:
+	Creates a .csv file to write data to, with suffix appended to
+	its name.  The headers will be the following:
 	Val0, Val1, ..., Val15, Score, Time, Agent, AgentHeur, Move, Trial
 	"""
 	numVals = state.size * state.size
 	currtime = datetime.datetime.now()
 	date = repr(currtime.day) + "-" + repr(currtime.hour) + "-" + \
 		   repr(currtime.minute) + "-" + repr(currtime.second)
-	fname = "logs/" + date + "-" + "2048-log.csv"
+	fname = "logs/" + date + "-" + "2048-log" + suffix + ".csv"
 	f = open(fname, "w+")
 
 	for i in range(numVals):
@@ -29,7 +29,21 @@ def beginLog(state):
 
 	return fname
 
+def formatStats(stats):
+	"""
+	Return the decision stats of an agent as semicolon-separated
+	key=value pairs, or N/A if there are none.
+	"""
+	if not stats:
+		return "N/A"
+	return ";".join("{}={}".format(key, value) for key, value in stats.items())
+
 def log(fileName, state, time, agent, move, trial):
+	"""
+	Appends a row for state to the log. AgentHeur holds the decision
+	stats of the agent (see Agent.decisionStats) for the move, and N/A
+	for the final state of a game.
+	"""
 
 	f = open(fileName, "a")
 
@@ -39,8 +53,9 @@ def log(fileName, state, time, agent, move, trial):
 			values += repr(state.grid[i][j]) + ","
 
 	score = state.score
+	heur = "N/A" if move == "N/A" else formatStats(agent.decisionStats())
 
-	f.write(values + repr(score) + "," + repr(time) + "," + type(agent).__name__ + ",N/A," + move + \
+	f.write(values + repr(score) + "," + repr(time) + "," + type(agent).__name__ + "," + heur + "," + moveName(move) + \
 		    "," + repr(trial) + "," + repr(state.mostRecentRandomTilePos[0] * state.size + state.mostRecentRandomTilePos[1]) + "\n")
 
 	f.close()
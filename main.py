@@ -4,28 +4,43 @@
 # such as the desired agent, whether the user would like to 
 # view the 2048 board as the game progresses, and so on.
 
-from gameObjects import *
-from game import *
-from pygame.locals import *
+from game import Game, runParallel, summarizeResults, printSummary
+from agentRegistry import AGENTS
+from agents import ExpectimaxAgent, MonteCarloAgent
+from nTupleAgents import NTupleAgent
 import sys
 import argparse
+import numpy as np
 
-availableAgents = [RandomAgent,
-				   MaxScoreExpectimaxAgent,
-				   MaxTileExpectimaxAgent,
-				   NumEmptyExpectimaxAgent,
-				   MaxTileCornerExpectimaxAgent,
-				   TileDiffExpectimaxAgent,
-				   FullMaxRowExpectimaxAgent,
-				   AscendingRowsExpectimaxAgent,
-				   WeightedExpectimaxAgent,
-				   MonotonicSnakeExpectimaxAgent,
-				   MonteCarloAgent, 
-				   QLearningAgent]
-
-def main(agent, depth=None, graphics=True, trials=1, dim=4, webview=False):
-	game = Game(agent, depth=depth, graphics=graphics, trials=trials, dim=dim, webview=webview)
-	game.run()
+availableAgents = [entry.agentClass for entry in AGENTS.values()]
+
+# Maximum depth of the iterative deepening search, when a time per move
+# but no depth is given
+MAX_ITERATIVE_DEPTH = 10
+
+def parseDuration(text):
+	"""
+	Parse a duration such as "50ms", "2s" or "0.5" (seconds) into seconds.
+	"""
+	if text.endswith("ms"):
+		return float(text[:-2]) / 1000.
+	if text.endswith("s"):
+		return float(text[:-1])
+	return float(text)
+
+def main(agent, depth=None, graphics=True, trials=1, dim=4, webview=False, bitboard=False,
+		 agentOptions=None, processes=1, seed=None):
+	# Draw the master seed here, so that it can be reported
+	seed = np.random.SeedSequence(seed).entropy
+	if processes > 1:
+		results = runParallel(agent, depth=depth, trials=trials, dim=dim, bitboard=bitboard,
+							  agentOptions=agentOptions, processes=processes, seed=seed)
+	else:
+		game = Game(agent, depth=depth, graphics=graphics, trials=trials, dim=dim, webview=webview,
+					bitboard=bitboard, agentOptions=agentOptions, seed=seed)
+		results = game.run()
+	print("Seed: {}".format(seed))
+	printSummary(summarizeResults(results))
 
 if __name__ == '__main__':
 
@@ -40,8 +55,81 @@ if __name__ == '__main__':
 	parser.add_argument("-t", "--trials", default=1, type=int, help="number of times to play")
 	parser.add_argument("-s", "--size", default=4, type=int, help="dimension of the board")
 	parser.add_argument("-w", "--webview", help="display webview of replay", action="store_true")
-	parser.add_argument("-d", "--depth", default=2, type=int, help="depth (in case of Expectimax)")
+	parser.add_argument("-d", "--depth", default=None, type=int,
+						help="depth (in case of Expectimax), 2 by default or {} with --time-per-move".format(
+							MAX_ITERATIVE_DEPTH))
+	parser.add_argument("-b", "--bitboard", help="use the 64-bit bitboard backend (size 4 only)", action="store_true")
+	parser.add_argument("--tt-size", default=None, type=int,
+						help="maximum number of positions in the transposition table (in case of Expectimax)")
+	parser.add_argument("--tt-persist", help="keep the transposition table between moves (in case of Expectimax)",
+						action="store_true")
+	parser.add_argument("--eval-cache-size", default=None, type=int,
+						help="maximum number of cached leaf evaluations (in case of Expectimax)")
+	parser.add_argument("--canonical-keys", action="store_true",
+						help="share cache entries between rotated and reflected boards when the heuristic "
+							 "allows it (in case of Expectimax)")
+	parser.add_argument("--prob-cutoff", default=0., type=float,
+						help="evaluate positions whose random tiles are less likely than this instead of "
+							 "searching them (in case of Expectimax)")
+	parser.add_argument("--time-per-move", default=None, type=parseDuration,
+						help="search deeper until this time (e.g. 50ms) has passed, up to the given depth "
+							 "(in case of Expectimax)")
+	parser.add_argument("--rollouts", default=None, type=int,
+						help="number of random games per candidate move (in case of MonteCarloAgent, 200 by default)")
+	parser.add_argument("--batched-rollouts", action="store_true",
+						help="play the rollouts of a move together as NumPy arrays (in case of MonteCarloAgent)")
+	parser.add_argument("--batch-leaves", action="store_true",
+						help="evaluate the leaves of the search in NumPy batches (in case of Expectimax)")
+	parser.add_argument("--profile-eval", action="store_true",
+						help="log the time spent on each evaluation feature per move (in case of Expectimax)")
+	parser.add_argument("--ntuple-weights", default=None,
+						help="weights file written by nTupleAgents.py (in case of NTupleAgent)")
+	parser.add_argument("--workers", default=None, type=int,
+						help="number of worker processes searching the root moves in parallel (in case of Expectimax) "
+							 "or playing the rollouts (in case of MonteCarloAgent, 4 by default)")
+	parser.add_argument("--seed", default=None, type=int,
+						help="master seed of the random tiles and agent choices, to reproduce a run")
+	parser.add_argument("-p", "--processes", default=1, type=int,
+						help="play the trials headless, split over this many processes with a log file each")
 
 	args = parser.parse_args()
 
-	main(args.agent, depth=args.depth, graphics=args.graphics, trials=args.trials, dim=args.size, webview=args.webview)
+	if args.processes > 1:
+		if args.workers is not None and args.workers > 1:
+			parser.error("--workers cannot be combined with --processes")
+		args.graphics = False
+		args.webview = False
+
+	agentOptions = {}
+	agentClass = availableAgents[agentNames.index(args.agent)]
+	if issubclass(agentClass, ExpectimaxAgent):
+		agentOptions["ttSize"] = args.tt_size
+		agentOptions["persistTT"] = args.tt_persist
+		agentOptions["evalCacheSize"] = args.eval_cache_size
+		agentOptions["canonicalKeys"] = args.canonical_keys
+		agentOptions["probCutoff"] = args.prob_cutoff
+		agentOptions["timePerMove"] = args.time_per_move
+		agentOptions["workers"] = args.workers
+		agentOptions["batchLeaves"] = args.batch_leaves
+		agentOptions["profileEval"] = args.profile_eval
+
+	if agentClass is MonteCarloAgent:
+		if args.workers is not None:
+			agentOptions["workers"] = args.workers
+		elif args.processes > 1:
+			# Worker processes of the trials cannot start their own
+			agentOptions["workers"] = 1
+		if args.rollouts is not None:
+			agentOptions["rollouts"] = args.rollouts
+		agentOptions["batched"] = args.batched_rollouts
+
+	if agentClass is NTupleAgent:
+		agentOptions["weightsFile"] = args.ntuple_weights
+
+	depth = args.depth
+	if depth is None:
+		depth = MAX_ITERATIVE_DEPTH if args.time_per_move is not None else 2
+
+	main(args.agent, depth=depth, graphics=args.graphics, trials=args.trials, dim=args.size, webview=args.webview,
+		 bitboard=args.bitboard, agentOptions=agentOptions, processes=args.processes,
+		 seed=args.seed)
@@ -0,0 +1,185 @@
+# nTupleAgents.py
+# ---------------
+# Contains implementation of an n-tuple network agent, which evaluates
+# the position after each move (the afterstate) as a sum of learned
+# weights looked up by the tile exponents of a few groups of four cells,
+# and learns these weights by temporal difference learning.
+# Run this file to train the weights, e.g.
+#	python nTupleAgents.py -e 5000 -o ntupleWeights.npy
+
+import numpy as np
+import argparse
+from agents import Agent
+from bitBoard import BitBoard
+from gameObjects import transformGrid
+
+# Groups of four cells as row-major indices: an outer and an inner row,
+# and three 2x2 squares. The other rows, the columns and the remaining
+# squares are covered by the 8 symmetries of the board.
+BASE_TUPLES = [(0, 1, 2, 3), (4, 5, 6, 7), (0, 1, 4, 5), (1, 2, 5, 6), (5, 6, 9, 10)]
+
+# Number of weights per tuple, one for each combination of four exponents
+TUPLE_SIZE = 16 ** 4
+
+TUPLE_SHIFTS = np.array([0, 4, 8, 12], dtype=np.int64)
+
+
+def symmetricTuples():
+	"""
+	Return the cells of every base tuple under each of the 8 symmetries of
+	the board as a (T,4) array, and the base tuple of each row as a (T,) array.
+	"""
+	indexGrid = [[4 * i + j for j in range(4)] for i in range(4)]
+	cells = []
+	tupleIds = []
+	for transform in range(8):
+		# Cell k of the transformed board is cell mapping[k] of the board
+		mapping = [k for row in transformGrid(indexGrid, transform) for k in row]
+		for tupleId, base in enumerate(BASE_TUPLES):
+			cells.append([mapping[k] for k in base])
+			tupleIds.append(tupleId)
+	return np.array(cells, dtype=np.int64), np.array(tupleIds, dtype=np.int64)
+
+
+class NTupleAgent(Agent):
+	"""
+	An agent choosing the move whose afterstate has the highest learned value.
+	"""
+
+	def __init__(self, weightsFile=None, alpha=0.0025, rng=None):
+		"""
+		Initialize an n-tuple agent.
+		weightsFile = .npy file of weights written by save, which is
+			memory-mapped read-only (None starts from zero weights)
+		alpha = learning rate of train, per weight
+		rng = np.random.Generator drawing the tiles of the training games
+		"""
+		self.alpha = alpha
+		self.cells, tupleIds = symmetricTuples()
+		self.offsets = tupleIds * TUPLE_SIZE
+
+		if weightsFile is not None:
+			weights = np.load(weightsFile, mmap_mode="r")
+			if weights.shape != (len(BASE_TUPLES), TUPLE_SIZE) or weights.dtype != np.float32:
+				raise ValueError("{} does not hold n-tuple weights.".format(weightsFile))
+		else:
+			weights = np.zeros((len(BASE_TUPLES), TUPLE_SIZE), dtype=np.float32)
+		self.setWeights(weights)
+		super().__init__(rng=rng)
+
+	def setWeights(self, weights):
+		"""
+		Use the given (P,65536) float32 array as weight tables.
+		"""
+		self.weights = weights
+		self.flatWeights = weights.reshape(-1)
+
+	def save(self, fileName):
+		"""
+		Write the weight tables to a .npy file.
+		"""
+		np.save(fileName, np.asarray(self.weights))
+
+	def tupleIndices(self, exps):
+		"""
+		Return the positions in flatWeights of the weights of every tuple,
+		for an (..., 16) array of tile exponents.
+		"""
+		exps = np.minimum(np.asarray(exps, dtype=np.int64), 15)
+		return self.offsets + (exps[..., self.cells] << TUPLE_SHIFTS).sum(axis=-1)
+
+	def values(self, exps):
+		"""
+		Return the value of each board of an (..., 16) array of tile exponents.
+		"""
+		return self.flatWeights[self.tupleIndices(exps)].sum(axis=-1, dtype=np.float64)
+
+	def afterstates(self, board):
+		"""
+		Return the valid moves of board, the tile exponents after each
+		of them and the score they gain.
+		"""
+		moves = board.validMoves()
+		exps = []
+		gains = []
+		for move in moves:
+			score = board.score
+			undo = board.makeMove(move)
+			exps.append(list(board.exponents()))
+			gains.append(board.score - score)
+			board.unmakeMove(undo)
+		return moves, exps, gains
+
+	def move(self, board):
+		"""
+		Return the move maximizing the score gained plus the value of
+		the afterstate.
+		"""
+		moves, exps, gains = self.afterstates(board)
+		if not moves:
+			return None
+		values = np.array(gains) + self.values(exps)
+		return moves[int(np.argmax(values))]
+
+	def update(self, exps, target):
+		"""
+		Move the value of the afterstate with tile exponents exps
+		towards target.
+		"""
+		indices = self.tupleIndices(exps)
+		error = target - self.flatWeights[indices].sum(dtype=np.float64)
+		np.add.at(self.flatWeights, indices, np.float32(self.alpha * error))
+
+	def train(self, episodes, boardClass=BitBoard):
+		"""
+		Play episodes games, learning from each move by TD(0) on the
+		afterstates. Return the final scores of the games.
+		"""
+		if not self.weights.flags.writeable:
+			# Memory-mapped weights are read-only, learn on a copy
+			self.setWeights(np.array(self.weights))
+
+		import tqdm
+		scores = []
+		for episode in tqdm.trange(episodes):
+			board = boardClass(rng=self.rng)
+			prevExps = None
+			while True:
+				moves, exps, gains = self.afterstates(board)
+				if not moves:
+					break
+				best = int(np.argmax(np.array(gains) + self.values(exps)))
+				if prevExps is not None:
+					# The value of the previous afterstate is the reward of
+					# this move plus the value of this afterstate
+					self.update(prevExps, gains[best] + self.values(exps[best]))
+				prevExps = exps[best]
+				board.shift(moves[best])
+				board.placeRandomTile(1)
+
+			# No reward follows the last afterstate
+			if prevExps is not None:
+				self.update(prevExps, 0.)
+			scores.append(board.score)
+		return scores
+
+
+if __name__ == '__main__':
+
+	parser = argparse.ArgumentParser(description='Train the weights of the n-tuple agent.')
+	parser.add_argument("-e", "--episodes", default=1000, type=int, help="number of games to train on")
+	parser.add_argument("-a", "--alpha", default=0.0025, type=float, help="learning rate")
+	parser.add_argument("-o", "--output", default="ntupleWeights.npy", help="file to write the weights to")
+	parser.add_argument("-r", "--resume", help="continue training the weights of the output file",
+						action="store_true")
+	parser.add_argument("-s", "--seed", default=None, type=int, help="seed of the training games")
+	args = parser.parse_args()
+
+	agent = NTupleAgent(weightsFile=args.output if args.resume else None, alpha=args.alpha,
+						rng=np.random.default_rng(args.seed))
+	scores = agent.train(args.episodes)
+	agent.save(args.output)
+
+	# Report progress over the last tenth of the games
+	last = scores[-max(1, len(scores) // 10):]
+	print("Mean score of the last {} games: {:.1f}".format(len(last), np.mean(last)))
@@ -14,13 +14,14 @@ class QLearningAgent(Agent):
 
 
 	def __init__(self, alpha=0.1, epsilon=0.05,
-				 gamma=0.6):
+				 gamma=0.6, rng=None):
 		"""
 		Initialize qLearningAgent
 		alpha = learning rate
 		epsilon = exploration probability
 		gamma = discounting future reward
 		iters = number of iterations to train q-learning agent
+		rng = np.random.Generator for exploring (see Agent)
 		"""
 
 		self.alpha = alpha
@@ -30,7 +31,7 @@ class QLearningAgent(Agent):
 		self.prevMove = None
 
 		self.weights = Evaluator.uniformWeights()
-		super().__init__()
+		super().__init__(rng=rng)
 
 
 	def getQValue(self, state, move):
@@ -38,7 +39,11 @@ class QLearningAgent(Agent):
 		Returns the q-Value for a given state-move pair by executing our
 		approximating Q(s, a) function
 		"""
-		nextState = state.getSuccessor(move, printOpts=False)
+		# Place the random tile of the successor with the generator of the
+		# agent, not that of the game
+		lookahead = state.copy()
+		lookahead.rng = self.rng
+		nextState = lookahead.getSuccessor(move, printOpts=False)
 		
 		# Takes into account current weights as well
 		return Evaluator.evaluate(nextState, self.weights)
@@ -69,12 +74,13 @@ class QLearningAgent(Agent):
 		given a certain board state.
 		"""
 
-		if self.prevMove:
+		if self.prevMove is not None:
 			self.updateWeights(state)
 
 		# Flip coin to determine if random move
-		if np.random.random() < self.epsilon:
-			bestMove = np.random.choice(state.validMoves())
+		if self.rng.random() < self.epsilon:
+			moves = state.validMoves()
+			bestMove = moves[self.rng.integers(len(moves))]
 		else:
 			bestMove = self.findBestMove(state)
 
@@ -0,0 +1,10 @@
+import sys
+sys.path.insert(0, '../../2048-AI')
+from gameObjects import *
+
+# A mid-game board with its largest tile in the bottom-right corner and
+# both merges and empty squares, shared by the search tests
+midGameConfig = [[0, 2, 4, 8],
+				 [0, 0, 2, 16],
+				 [0, 0, 0, 32],
+				 [2, 0, 4, 1024]]
@@ -0,0 +1,29 @@
+import sys
+import pytest
+sys.path.insert(0, '../../2048-AI')
+from agentRegistry import AGENTS, createAgent
+from agents import MonteCarloAgent, WeightedExpectimaxAgent
+
+def test_createWithOptions():
+	agent = createAgent("WeightedExpectimaxAgent", depth=3, ttSize=100, probCutoff=0)
+	assert isinstance(agent, WeightedExpectimaxAgent)
+	assert agent.maxDepth == 3
+	assert agent.transpositionTable.maxSize == 100
+	assert isinstance(agent.probCutoff, float)
+
+def test_noneKeepsDefault():
+	agent = createAgent("MonteCarloAgent", depth=2, rollouts=None, workers=1)
+	assert isinstance(agent, MonteCarloAgent)
+	assert agent.rollouts == 200
+
+def test_invalidOptions():
+	with pytest.raises(ValueError):
+		createAgent("RandomAgent", rollouts=10)
+	with pytest.raises(TypeError):
+		createAgent("MonteCarloAgent", rollouts="10")
+	with pytest.raises(ValueError):
+		createAgent("NoSuchAgent")
+
+def test_namesMatchClasses():
+	for name, entry in AGENTS.items():
+		assert entry.agentClass.__name__ == name
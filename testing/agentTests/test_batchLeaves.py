@@ -0,0 +1,35 @@
+import sys
+import numpy as np
+import pytest
+sys.path.insert(0, '../../2048-AI')
+from gameObjects import *
+from evaluators import Evaluator
+from agents import WeightedExpectimaxAgent
+from allAgentTests import midGameConfig
+
+@pytest.mark.parametrize("depth", [1, 2])
+def test_sameResultsAsLeafByLeaf(depth):
+	plain = WeightedExpectimaxAgent(depth=depth)
+	batched = WeightedExpectimaxAgent(depth=depth, batchLeaves=True)
+	board = Board(config=midGameConfig, rng=np.random.default_rng(0))
+	for _ in range(6):
+		move, value = batched.findBestMove(board, depth)
+		plainMove, plainValue = plain.findBestMove(board, depth)
+		assert move == plainMove
+		assert value == pytest.approx(plainValue)
+		board = board.getSuccessor(move, printOpts=False)
+
+def test_oneBatchPerMaxNode(monkeypatch):
+	calls = []
+	evaluateBatch = Evaluator.evaluateBatch
+	def countingEvaluateBatch(boards, weights, scores=None):
+		calls.append(len(boards))
+		return evaluateBatch(boards, weights, scores)
+	monkeypatch.setattr(Evaluator, "evaluateBatch", countingEvaluateBatch)
+
+	agent = WeightedExpectimaxAgent(depth=2, batchLeaves=True)
+	agent.move(Board(config=midGameConfig))
+	stats = agent.decisionStats()
+	# Every max node but the root is one move above the leaves
+	assert len(calls) == stats["maxNodes"] - 1
+	assert sum(calls) == stats["leafEvals"]
@@ -0,0 +1,32 @@
+import sys
+import numpy as np
+import pytest
+sys.path.insert(0, '../../2048-AI')
+from gameObjects import *
+from agents import MonteCarloAgent
+
+config = [[2, 4, 8, 16], [4, 8, 16, 32], [0, 2, 4, 8], [0, 0, 2, 4]]
+
+def test_batchedMove():
+	board = Board(config=config)
+	agent = MonteCarloAgent(rollouts=20, batched=True, rng=np.random.default_rng(0))
+	assert agent.move(board) in board.validMoves()
+	assert board.grid == config
+
+def test_batchedMatchesPerGameRollouts():
+	board = Board(config=config)
+	agent = MonteCarloAgent(rollouts=300, workers=1, rng=np.random.default_rng(1))
+	for move in board.validMoves():
+		# Both estimate the same mean score, from different random games
+		assert agent.batchRollout(move, board) == pytest.approx(agent.rollout(move, board), rel=0.1)
+
+def test_unbatchableBoardsFallBack():
+	configs = [([[2, 4, 8], [0, 2, 4], [0, 0, 2]], 3),
+			   ([[32768, 4, 8, 16], [4, 8, 16, 32], [0, 2, 4, 8], [0, 0, 2, 4]], 4)]
+	for config, size in configs:
+		board = Board(size=size, config=config)
+		moves = []
+		for batched in (True, False):
+			agent = MonteCarloAgent(rollouts=5, workers=1, batched=batched, rng=np.random.default_rng(2))
+			moves.append(agent.move(board))
+		assert moves[0] == moves[1]
@@ -0,0 +1,31 @@
+import sys
+import pytest
+sys.path.insert(0, '../../2048-AI')
+from caches import LRUCache
+
+def test_evictsLeastRecentlyUsed():
+	cache = LRUCache(2)
+	cache.put("a", 1)
+	cache.put("b", 2)
+	# Reading a makes b the least recently used entry
+	assert cache.get("a") == 1
+	cache.put("c", 3)
+	assert cache.get("b") is None
+	assert cache.get("a") == 1
+	assert cache.get("c") == 3
+	assert len(cache) == 2
+
+def test_counters():
+	cache = LRUCache(1)
+	cache.put("a", 1)
+	cache.get("a")
+	cache.get("b")
+	cache.put("b", 2)
+	assert cache.stats() == {"size": 1, "hits": 1, "misses": 1, "evictions": 1, "hitRate": 0.5}
+	cache.clear()
+	assert len(cache) == 0
+	assert cache.hits == 1
+
+def test_positiveSize():
+	with pytest.raises(ValueError):
+		LRUCache(0)
@@ -0,0 +1,48 @@
+import sys
+sys.path.insert(0, '../../2048-AI')
+from gameObjects import *
+from agents import ExpectimaxAgent, WeightedExpectimaxAgent
+from logger import formatStats
+from allAgentTests import midGameConfig
+
+def numLeaves(board):
+	total = 0
+	for move in board.validMoves():
+		successor = board.copy()
+		successor.shift(move)
+		total += 2 * len(successor.emptySquares())
+	return total
+
+def test_depthOneCounters():
+	board = Board(config=midGameConfig)
+	for batchLeaves in (False, True):
+		agent = ExpectimaxAgent({"score": 1, "numEmpty": 1}, 1, batchLeaves=batchLeaves)
+		agent.move(board)
+		stats = agent.decisionStats()
+		assert stats["maxNodes"] == 1
+		assert stats["chanceNodes"] == len(board.validMoves())
+		assert stats["leafEvals"] == numLeaves(board)
+		assert stats["depth"] == 1
+
+def test_countersResetPerMove():
+	board = Board(config=midGameConfig)
+	agent = WeightedExpectimaxAgent(depth=2, evalCacheSize=100000)
+	agent.move(board)
+	first = agent.decisionStats()
+	agent.move(board)
+	second = agent.decisionStats()
+	# The second search finds every leaf in the evaluation cache
+	assert second["maxNodes"] == first["maxNodes"]
+	assert second["leafEvals"] == 0
+	assert second["evalCacheHits"] == first["leafEvals"] + first["evalCacheHits"]
+
+def test_profileEval():
+	agent = ExpectimaxAgent({"score": 1, "tileDiff": 1}, 1, profileEval=True)
+	agent.move(Board(config=midGameConfig))
+	stats = agent.decisionStats()
+	assert set(["evalMs.scan", "evalMs.score", "evalMs.tileDiff"]) <= set(stats)
+	assert stats["evalMs.tileDiff"] > 0
+
+def test_formatStats():
+	assert formatStats({}) == "N/A"
+	assert formatStats({"maxNodes": 3, "depth": 2}) == "maxNodes=3;depth=2"
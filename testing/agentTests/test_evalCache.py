@@ -0,0 +1,32 @@
+import sys
+import numpy as np
+import pytest
+sys.path.insert(0, '../../2048-AI')
+from gameObjects import *
+from agents import WeightedExpectimaxAgent, MonotonicSnakeExpectimaxAgent, MaxTileCornerExpectimaxAgent
+from allAgentTests import midGameConfig
+
+def playAndSearch(agent, moves=6, seed=0):
+	"""Return the (move, value) of every search along a seeded game."""
+	board = Board(config=midGameConfig, rng=np.random.default_rng(seed))
+	results = []
+	for _ in range(moves):
+		result = agent.findBestMove(board, agent.maxDepth)
+		results.append(result)
+		board = board.getSuccessor(result[0], printOpts=False)
+	return results
+
+@pytest.mark.parametrize("agentClass", [WeightedExpectimaxAgent, MonotonicSnakeExpectimaxAgent,
+										MaxTileCornerExpectimaxAgent])
+def test_sameResultsWithEvictions(agentClass):
+	plain = playAndSearch(agentClass(depth=2))
+	agent = agentClass(depth=2, evalCacheSize=100)
+	assert playAndSearch(agent) == plain
+
+	stats = agent.cacheStats()["evalCache"]
+	# Every miss evaluates the leaf and stores a new entry
+	assert stats["hits"] == agent.counters["evalCacheHits"]
+	assert stats["misses"] == agent.counters["leafEvals"]
+	assert stats["size"] == 100
+	assert stats["evictions"] == stats["misses"] - stats["size"]
+	assert stats["hits"] > 0
@@ -0,0 +1,39 @@
+import sys
+import time
+sys.path.insert(0, '../../2048-AI')
+from gameObjects import *
+from agents import WeightedExpectimaxAgent
+from allAgentTests import midGameConfig
+
+def makeBoard():
+	board = Board(config=midGameConfig)
+	board.score = 500
+	return board
+
+def assertUnchanged(board, validMoves):
+	assert board.grid == midGameConfig
+	assert board.score == 500
+	assert board.validMoves() == validMoves
+
+def test_timePerMove():
+	for timePerMove in (0.0001, 0.005, 0.05):
+		board = makeBoard()
+		validMoves = board.validMoves()
+		agent = WeightedExpectimaxAgent(depth=6, timePerMove=timePerMove)
+		move = agent.move(board)
+		assert move in validMoves
+		assert 1 <= agent.depthReached < 6
+		assert agent.depthsReached == [agent.depthReached]
+		assert agent.deadline is None and not agent.timedOut
+		assertUnchanged(board, validMoves)
+
+def test_abandonedSearchRestoresBoard():
+	board = makeBoard()
+	validMoves = board.validMoves()
+	agent = WeightedExpectimaxAgent(depth=4)
+	# A depth 4 search takes far longer than this
+	agent.deadline = time.time() + 0.003
+	agent.findBestMove(board, 4)
+	assert agent.timedOut
+	assert agent.counters["maxNodes"] > 1
+	assertUnchanged(board, validMoves)
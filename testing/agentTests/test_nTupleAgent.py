@@ -0,0 +1,34 @@
+import sys
+import numpy as np
+sys.path.insert(0, '../../2048-AI')
+from gameObjects import *
+from nTupleAgents import NTupleAgent, BASE_TUPLES
+from allAgentTests import midGameConfig
+
+def randomAgent(seed=0):
+	agent = NTupleAgent()
+	agent.setWeights(np.random.RandomState(seed).rand(len(BASE_TUPLES), 16 ** 4).astype(np.float32))
+	return agent
+
+def test_valueIsSymmetric():
+	agent = randomAgent()
+	values = [agent.values(Board(config=transformGrid(midGameConfig, transform)).exponents())
+			  for transform in range(8)]
+	assert np.allclose(values, values[0])
+
+def test_saveAndLoad(tmp_path):
+	agent = randomAgent()
+	fileName = str(tmp_path / "weights.npy")
+	agent.save(fileName)
+	loaded = NTupleAgent(weightsFile=fileName)
+	assert not loaded.weights.flags.writeable
+	boardTest = Board(config=midGameConfig)
+	assert loaded.values(boardTest.exponents()) == agent.values(boardTest.exponents())
+	assert loaded.move(boardTest) == agent.move(boardTest)
+
+def test_updateMovesValueToTarget():
+	agent = NTupleAgent(alpha=0.01)
+	exps = Board(config=midGameConfig).exponents()
+	for _ in range(200):
+		agent.update(exps, 100.)
+	assert abs(agent.values(exps) - 100.) < 1.
@@ -0,0 +1,16 @@
+import sys
+sys.path.insert(0, '../../2048-AI')
+from gameObjects import *
+from agents import WeightedExpectimaxAgent
+from allAgentTests import midGameConfig
+
+def test_workersMatchSerialSearch():
+	board = Board(config=midGameConfig)
+	serial = WeightedExpectimaxAgent(depth=2).searchRoot(board, 2)
+	agent = WeightedExpectimaxAgent(depth=2, workers=2)
+	try:
+		assert agent.searchRoot(board, 2) == serial
+		assert agent.move(board) == serial[0]
+	finally:
+		agent.close()
+	assert board.grid == midGameConfig
@@ -0,0 +1,22 @@
+import sys
+sys.path.insert(0, '../../2048-AI')
+from gameObjects import *
+from agents import WeightedExpectimaxAgent
+from allAgentTests import midGameConfig
+
+def search(probCutoff):
+	agent = WeightedExpectimaxAgent(depth=2, probCutoff=probCutoff)
+	result = agent.findBestMove(Board(config=midGameConfig), 2)
+	return result, agent.counters
+
+def test_zeroCutoffChangesNothing():
+	plain = WeightedExpectimaxAgent(depth=2)
+	assert search(0.)[0] == plain.findBestMove(Board(config=midGameConfig), 2)
+	assert search(0.)[1] == plain.counters
+
+def test_highCutoffPrunes():
+	(move, value), counters = search(0.)
+	(prunedMove, prunedValue), prunedCounters = search(0.05)
+	assert prunedMove in Board(config=midGameConfig).validMoves()
+	assert prunedCounters["chanceNodes"] < counters["chanceNodes"]
+	assert prunedCounters["maxNodes"] < counters["maxNodes"]
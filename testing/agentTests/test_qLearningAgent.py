@@ -0,0 +1,23 @@
+import sys
+import numpy as np
+sys.path.insert(0, '../../2048-AI')
+from gameObjects import *
+from qLearningAgents import QLearningAgent
+
+def test_updatesAfterLeft():
+	board = Board(config=[[2, 0, 0, 0], [4, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 2]])
+	agent = QLearningAgent(epsilon=0., rng=np.random.default_rng(0))
+	updates = []
+	agent.updateWeights = lambda state: updates.append(state)
+	agent.prevState = board
+	agent.prevMove = Move.LEFT
+	agent.move(board)
+	assert updates == [board]
+
+def test_lookaheadDoesNotDrawTiles():
+	board = Board(rng=np.random.default_rng(0))
+	state = board.rng.bit_generator.state
+	agent = QLearningAgent(epsilon=0., rng=np.random.default_rng(1))
+	agent.move(board)
+	agent.move(board.copy())
+	assert board.rng.bit_generator.state == state
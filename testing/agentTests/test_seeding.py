@@ -0,0 +1,46 @@
+import sys
+import numpy as np
+sys.path.insert(0, '../../2048-AI')
+from gameObjects import *
+from bitBoard import BitBoard
+from batchBoard import BatchBoard
+from agents import RandomAgent, MonteCarloAgent
+
+def playGame(boardClass, seed):
+	board = boardClass(rng=np.random.default_rng(seed))
+	agent = RandomAgent(rng=np.random.default_rng(seed + 1))
+	grids = []
+	while not board.isGameOver():
+		board = board.getSuccessor(agent.move(board), printOpts=False)
+		grids.append(board.grid)
+	return grids, board.score
+
+def test_seededGamesRepeat():
+	for boardClass in (Board, BitBoard):
+		assert playGame(boardClass, 3) == playGame(boardClass, 3)
+	assert playGame(Board, 3) == playGame(BitBoard, 3)
+
+def test_seededBatchBoardsRepeat():
+	games = [BatchBoard(n=50, rng=np.random.default_rng(5)) for _ in range(2)]
+	for _ in range(20):
+		for game in games:
+			game.step(game.randomValidMoves())
+	assert np.array_equal(games[0].exps, games[1].exps)
+
+def test_rolloutsDoNotDrawTiles():
+	board = Board(rng=np.random.default_rng(0))
+	state = board.rng.bit_generator.state
+	MonteCarloAgent(rollouts=3, workers=1, rng=np.random.default_rng(1)).move(board)
+	assert board.rng.bit_generator.state == state
+
+def test_rolloutsIndependentOfWorkers():
+	board = Board(config=[[2, 4, 8, 16], [0, 0, 2, 4], [0, 0, 0, 2], [0, 0, 0, 0]])
+	scores = []
+	for workers, chunkSize in ((1, None), (2, None), (2, 1)):
+		agent = MonteCarloAgent(rollouts=4, workers=workers, chunkSize=chunkSize, rng=np.random.default_rng(2))
+		try:
+			scores.append(agent.multiProcessingRollout(board.validMoves(), board))
+		finally:
+			agent.close()
+	assert np.array_equal(scores[0], scores[1])
+	assert np.array_equal(scores[0], scores[2])
@@ -0,0 +1,70 @@
+import sys
+import numpy as np
+import pytest
+sys.path.insert(0, '../../2048-AI')
+from gameObjects import *
+from bitBoard import BitBoard
+from agents import ExpectimaxAgent, WeightedExpectimaxAgent
+from allAgentTests import midGameConfig
+
+def playAndSearch(agent, moves=8, seed=0):
+	"""Return the (move, value) of every search along a seeded game."""
+	board = Board(config=midGameConfig, rng=np.random.default_rng(seed))
+	results = []
+	for _ in range(moves):
+		if agent.transpositionTable is not None and not agent.persistTT:
+			agent.transpositionTable.clear()
+		result = agent.findBestMove(board, agent.maxDepth)
+		results.append(result)
+		board = board.getSuccessor(result[0], printOpts=False)
+	return results
+
+def test_sameResultsAsPlainSearch():
+	plain = playAndSearch(WeightedExpectimaxAgent(depth=2))
+	for options in ({"ttSize": 100000}, {"ttSize": 100000, "persistTT": True}, {"ttSize": 50},
+					{"ttSize": 50, "persistTT": True}):
+		agent = WeightedExpectimaxAgent(depth=2, **options)
+		assert playAndSearch(agent) == plain
+
+def test_persistKeepsEntries():
+	board = Board(config=midGameConfig)
+	for persistTT in (False, True):
+		agent = WeightedExpectimaxAgent(depth=2, ttSize=100000, persistTT=persistTT)
+		move = agent.move(board)
+		assert agent.transpositionTable.hits == 0
+		# The root was stored by the first search and is only found if kept
+		assert agent.move(board) == move
+		assert agent.transpositionTable.hits == (1 if persistTT else 0)
+
+def test_smallTableEvicts():
+	agent = WeightedExpectimaxAgent(depth=2, ttSize=50)
+	playAndSearch(agent, moves=2)
+	assert len(agent.transpositionTable) <= 50
+	assert agent.transpositionTable.evictions > 0
+
+@pytest.mark.parametrize("boardClass", [Board, BitBoard])
+def test_canonicalKeysMatchPlainSearch(boardClass):
+	weights = {"score": 1, "numEmpty": 3}
+	agent = ExpectimaxAgent(weights, 2, ttSize=100000, persistTT=True, canonicalKeys=True)
+	assert agent.symmetric
+	board = boardClass(config=midGameConfig, rng=np.random.default_rng(0))
+	for _ in range(8):
+		move, value = agent.findBestMove(board, 2)
+		# Moves stored in the canonical frame are mapped back to this board
+		assert move in board.validMoves()
+		plainValue = ExpectimaxAgent(weights, 2).findBestMove(board, 2)[1]
+		assert value == pytest.approx(plainValue)
+		board = board.getSuccessor(move, printOpts=False)
+	assert agent.transpositionTable.hits > 0
+
+	# Every rotation and reflection of a searched board is found at the
+	# root, and the stored move is mapped to an equally good move
+	agent.findBestMove(board, 2)
+	for transform in range(8):
+		symmetricBoard = boardClass(config=transformGrid(board.grid, transform))
+		symmetricBoard.score = board.score
+		hits = agent.transpositionTable.hits
+		move, value = agent.findBestMove(symmetricBoard, 2)
+		assert agent.transpositionTable.hits == hits + 1
+		plain = ExpectimaxAgent(weights, 2)
+		assert plain.expectedValue(symmetricBoard, move, 2, 1.) == pytest.approx(value)
@@ -0,0 +1,23 @@
+import sys
+import pytest
+sys.path.insert(0, '../../2048-AI')
+from gameObjects import *
+from evaluators import Evaluator
+from test_lineTables import randomConfigs
+
+weightSets = [{feature: 1} for feature in Evaluator.features] + \
+			 [Evaluator.uniformWeights(),
+			  {"score": 7, "maxTile": 7, "numEmpty": 7, "maxTileCorner": 5, "tileDiff": 5, "monotonicity": 4}]
+
+def test_unknownFeature():
+	with pytest.raises(ValueError):
+		Evaluator.compile({"corner": 1})
+
+@pytest.mark.parametrize("weights", weightSets)
+@pytest.mark.parametrize("size", [3, 4, 5])
+def test_compiledMatchesEvaluate(weights, size):
+	compiled = Evaluator.compile(weights)
+	for k, config in enumerate(randomConfigs(100, seed=2, size=size)):
+		boardTest = Board(size=size, config=config)
+		boardTest.score = 100 * k
+		assert compiled(boardTest) == pytest.approx(Evaluator.evaluate(boardTest, weights))
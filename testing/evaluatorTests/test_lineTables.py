@@ -0,0 +1,47 @@
+import sys
+import random
+import pytest
+sys.path.insert(0, '../../2048-AI')
+from gameObjects import *
+from bitBoard import BitBoard
+from evaluators import Evaluator
+
+def randomConfigs(n, seed=0, size=4):
+	rand = random.Random(seed)
+	configs = []
+	while len(configs) < n:
+		config = [[rand.choice([0, 0, 0, 2, 4, 8, 16, 128, 2048]) for _ in range(size)] for _ in range(size)]
+		if any(val != 0 for row in config for val in row):
+			configs.append(config)
+	return configs
+
+@pytest.mark.parametrize("feature", ["monotonicity", "tileDiff", "snakeMonotonicity"])
+def test_lineTablesMatchScan(feature):
+	for config in randomConfigs(200):
+		expected = getattr(Evaluator, feature + "Scan")(Board(config=config))
+		assert getattr(Evaluator, feature)(Board(config=config)) == pytest.approx(expected)
+		assert getattr(Evaluator, feature)(BitBoard(config=config)) == pytest.approx(expected)
+
+def test_lineTablesNumEmpty():
+	for config in randomConfigs(200):
+		boardTest = Board(config=config)
+		assert Evaluator.numEmpty(boardTest) == len(boardTest.emptySquares())
+
+@pytest.mark.parametrize("feature", Evaluator.features)
+def test_evaluateBatch(feature):
+	boards = [Board(config=config) for config in randomConfigs(100, seed=1)]
+	for k, boardTest in enumerate(boards):
+		boardTest.score = 100 * k
+	exps = [boardTest.exponents() for boardTest in boards]
+	scores = [boardTest.score for boardTest in boards]
+	values = Evaluator.evaluateBatch(exps, {feature: 1}, scores)
+	expected = [Evaluator.evaluate(boardTest, {feature: 1}) for boardTest in boards]
+	assert list(values) == pytest.approx(expected)
+
+def test_evaluateBatchRejectsLargeTiles():
+	exps = [list(Board(config=config).exponents()) for config in randomConfigs(2)]
+	exps[1][5] = 16
+	with pytest.raises(ValueError):
+		Evaluator.evaluateBatch(exps, {"numEmpty": 1})
+	exps[1][5] = 15
+	assert len(Evaluator.evaluateBatch(exps, {"numEmpty": 1})) == 2
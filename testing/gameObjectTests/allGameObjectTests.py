@@ -14,7 +14,7 @@ config1 = [[0, 0, 0, 2],
 config1Free = [(0,0), (0, 1), (0, 2), 
 			   (1, 0), (1, 3), (2, 0), 
 			   (2, 1), (3, 2), (3, 3)]
-config1ValidMoves = ["LEFT", "RIGHT", "UP", "DOWN"]
+config1ValidMoves = [Move.LEFT, Move.RIGHT, Move.UP, Move.DOWN]
 config1ShiftLeft = [[2, 0, 0, 0],
 		   			[4, 0, 0, 0],
 		   			[2, 4, 0, 0],
@@ -53,7 +53,7 @@ config3 = [[2, 2, 2, 2],
 		   [2, 2, 2, 2]]
 
 config3Free = []
-config3ValidMoves = ["LEFT", "RIGHT", "UP", "DOWN"]
+config3ValidMoves = [Move.LEFT, Move.RIGHT, Move.UP, Move.DOWN]
 
 """ <-------- TEST 4 --------> """
 config4 = [[0, 0, 0, 2],
@@ -65,7 +65,7 @@ config4Free = [(0,0), (0,1), (0,2),
 			   (1,0), (1,1), (1,2),
 			   (2,0), (2,1), (2,2),
 			   (3,0), (3,1), (3,2)]
-config4ValidMoves = ["LEFT", "UP", "DOWN"]
+config4ValidMoves = [Move.LEFT, Move.UP, Move.DOWN]
 
 config4ShiftDown = [[0, 0, 0, 0],
 		   			[0, 0, 0, 0],
@@ -81,7 +81,7 @@ config5 = [[2, 2, 2, 2],
 config5Free = [(1,0), (1,1), (1,2), (1,3),
 			   (2,0), (2,1), (2,2), (2,3),
 			   (3,0), (3,1), (3,2), (3,3)]
-config5ValidMoves = ["LEFT", "RIGHT", "DOWN"]
+config5ValidMoves = [Move.LEFT, Move.RIGHT, Move.DOWN]
 
 config5ShiftLeft = [[4, 4, 0, 0],
 		   			[0, 0, 0, 0],
@@ -98,7 +98,7 @@ config6Free = [(0,1), (0,2), (0,3),
 			   (1,1), (1,2), (1,3),
 			   (2,1), (2,2), (2,3),
 			   (3,1), (3,2), (3,3)]
-config6ValidMoves = ["RIGHT", "UP", "DOWN"]
+config6ValidMoves = [Move.RIGHT, Move.UP, Move.DOWN]
 
 """ <-------- TEST 7 --------> """
 config7 = [[0, 0, 0, 0],
@@ -109,7 +109,7 @@ config7 = [[0, 0, 0, 0],
 config7Free = [(0,0), (0,1), (0,2), (0,3),
 			   (1,0), (1,1), (1,2), (1,3),
 			   (2,0), (2,1), (2,2), (2,3)]
-config7ValidMoves = ["LEFT", "RIGHT", "UP"]
+config7ValidMoves = [Move.LEFT, Move.RIGHT, Move.UP]
 
 """ <-------- TEST 8 --------> """
 config8 = [[0, 0, 0, 0],
@@ -121,7 +121,7 @@ config8Free = [(0,0), (0,1), (0,2), (0,3),
 			   (1,0), (1,1), (1,2), (1,3),
 			   (2,0), (2,1), (2,2), (2,3),
 			   (3,0), (3,1)]
-config8ValidMoves = ["LEFT", "UP"]
+config8ValidMoves = [Move.LEFT, Move.UP]
 
 """ <-------- TEST 9 --------> """
 config9 = [[2, 4, 2, 4],
@@ -139,7 +139,7 @@ config10 = [[16, 4, 2, 4],
 		    [8, 2, 4, 2]]
 
 config10Free = []
-config10ValidMoves = ["UP", "DOWN"]
+config10ValidMoves = [Move.UP, Move.DOWN]
 
 config10ShiftUp = [[32, 4, 2, 4],
 		    	   [16, 2, 4, 2],
@@ -0,0 +1,30 @@
+from allGameObjectTests import *
+from batchBoard import BatchBoard, MOVES
+import numpy as np
+
+configs = [config1, config2, config3, config4, config5, config6,
+		   config7, config8, config9, config10, config11, config12]
+
+def test_batchBoardShift():
+	for move in range(4):
+		batchTest = BatchBoard.fromBoards([Board(config=config) for config in configs])
+		batchTest.shift(move)
+		for k, config in enumerate(configs):
+			boardTest = Board(config=config)
+			boardTest.shift(MOVES[move])
+			assert batchTest.values()[k].tolist() == boardTest.grid
+			assert batchTest.scores[k] == boardTest.score
+
+def test_batchBoardValidMoves():
+	batchTest = BatchBoard.fromBoards([Board(config=config) for config in configs])
+	mask = batchTest.validMoveMask()
+	for k, config in enumerate(configs):
+		boardTest = Board(config=config)
+		assert set(MOVES[m] for m in range(4) if mask[k, m]) == set(boardTest.validMoves())
+		assert batchTest.isGameOver()[k] == boardTest.isGameOver()
+
+def test_batchBoardStep():
+	batchTest = BatchBoard.fromBoards([Board(config=config1), Board(config=config9)])
+	changed = batchTest.step(np.array([0, 0]))
+	assert changed.tolist() == [True, False]
+	assert batchTest.numberEmpty().tolist() == [9, 0]
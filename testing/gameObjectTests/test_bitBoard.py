@@ -0,0 +1,33 @@
+from allGameObjectTests import *
+from bitBoard import BitBoard
+import pytest
+
+configs = [config1, config2, config3, config4, config5, config6,
+		   config7, config8, config9, config10, config11, config12]
+
+@pytest.mark.parametrize("config", configs)
+def test_bitBoardShift(config):
+	for move in ["LEFT", "RIGHT", "UP", "DOWN"]:
+		boardTest = Board(config=config)
+		bitBoardTest = BitBoard(config=config)
+		boardTest.shift(move)
+		bitBoardTest.shift(move)
+		assert bitBoardTest.grid == boardTest.grid
+		assert bitBoardTest.score == boardTest.score
+
+@pytest.mark.parametrize("config", configs)
+def test_bitBoardValidMoves(config):
+	boardTest = Board(config=config)
+	bitBoardTest = BitBoard(config=config)
+	assert set(bitBoardTest.validMoves()) == set(boardTest.validMoves())
+	assert bitBoardTest.emptySquares() == boardTest.emptySquares()
+	assert bitBoardTest.maxTile() == boardTest.maxTile()
+
+def test_bitBoardGetSuccessorsLeft():
+	bitBoardTest = BitBoard(config=config12)
+	successorStates, successorProbs = bitBoardTest.getAllSuccessors("LEFT")
+	successorGrids = [x.grid for x in successorStates]
+	testGrids, testProbs = config12SuccessorsLeft
+	testProbs = [pytest.approx(x, .01) for x in testProbs]
+	assert successorGrids == testGrids
+	assert successorProbs == testProbs
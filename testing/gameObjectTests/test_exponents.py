@@ -0,0 +1,20 @@
+from allGameObjectTests import *
+import pytest
+
+configs = [config1, config2, config3, config4, config5, config6,
+		   config7, config8, config9, config10, config11, config12]
+
+@pytest.mark.parametrize("config", configs)
+def test_exponentsMatchGrid(config):
+	boardTest = Board(config=config)
+	assert boardTest.grid == config
+	assert [2 ** exp if exp != 0 else 0 for exp in boardTest.exponents()] == \
+		[val for row in config for val in row]
+
+def test_setGrid():
+	boardTest = Board(config=config1)
+	boardTest.shift("LEFT")
+	boardTest.grid = config2
+	assert boardTest.grid == config2
+	assert boardTest.emptySquares() == Board(config=config2).emptySquares()
+	assert boardTest.maxTile() == Board(config=config2).maxTile()
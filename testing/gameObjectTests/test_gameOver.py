@@ -0,0 +1,19 @@
+from allGameObjectTests import *
+from bitBoard import BitBoard
+import allGameObjectTests
+import re
+import pytest
+
+configs = [getattr(allGameObjectTests, name) for name in sorted(dir(allGameObjectTests))
+		   if re.match(r"config\d+$", name)]
+
+@pytest.mark.parametrize("boardClass", [Board, BitBoard])
+def test_isGameOverMatchesValidMoves(boardClass):
+	results = []
+	for config in configs:
+		# Separate boards, so that isGameOver cannot use cached valid moves
+		gameOver = boardClass(config=config).isGameOver()
+		assert gameOver == (len(boardClass(config=config).validMoves()) == 0)
+		results.append(gameOver)
+	# The configs include both finished and playable boards
+	assert True in results and False in results
@@ -1,4 +1,5 @@
 from allGameObjectTests import *
+from bitBoard import BitBoard
 import pytest
 
 def test_1_getSuccessorsLeft():
@@ -8,4 +9,31 @@ def test_1_getSuccessorsLeft():
 	testGrids, testProbs = config12SuccessorsLeft
 	testProbs = [pytest.approx(x, .01) for x in testProbs]
 	assert successorGrids == testGrids
-	assert successorProbs == testProbs
\ No newline at end of file
+	assert successorProbs == testProbs
+def test_2_getSuccessorsLeftMove():
+	boardTest = Board(config=config12)
+	successorStates, successorProbs = boardTest.getAllSuccessors(Move.LEFT)
+	testGrids, testProbs = config12SuccessorsLeft
+	assert [x.grid for x in successorStates] == testGrids
+	assert successorProbs == [pytest.approx(x, .01) for x in testProbs]
+
+@pytest.mark.parametrize("boardClass", [Board, BitBoard])
+def test_3_iterSuccessorsRestoresBoard(boardClass):
+	for config in (config1, config4, config10, config12):
+		boardTest = boardClass(config=config)
+		boardTest.score = 100
+		validMoves = boardTest.validMoves()
+		for move in validMoves:
+			# Full iteration
+			grids = [successor.grid for successor, _ in boardTest.iterSuccessors(move)]
+			assert len(grids) > 0
+			assert boardTest.grid == config
+			assert boardTest.score == 100
+			assert boardTest.validMoves() == validMoves
+			# Abandoned after the first successor
+			successors = boardTest.iterSuccessors(move)
+			next(successors)
+			successors.close()
+			assert boardTest.grid == config
+			assert boardTest.score == 100
+			assert boardTest.validMoves() == validMoves
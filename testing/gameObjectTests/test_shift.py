@@ -39,4 +39,11 @@ def test_10_shiftUp():
 def test_10_shiftDown():
 	boardTest = Board(config=config10)
 	boardTest.shift("DOWN")
-	assert boardTest.grid == config10ShiftDown
\ No newline at end of file
+	assert boardTest.grid == config10ShiftDown
+
+def test_10_makeUnmakeMove():
+	boardTest = Board(config=config10)
+	undo = boardTest.makeMove("DOWN")
+	assert boardTest.grid == config10ShiftDown
+	boardTest.unmakeMove(undo)
+	assert boardTest.grid == config10
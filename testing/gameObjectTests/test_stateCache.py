@@ -0,0 +1,48 @@
+from allGameObjectTests import *
+import pytest
+
+def cachesFilled(boardTest):
+	boardTest.emptySquares()
+	boardTest.validMoves()
+	boardTest.maxTile()
+	return boardTest
+
+def cachesEmpty(boardTest):
+	return boardTest.emptyCache is None and boardTest.movesCache is None and boardTest.maxCache is None
+
+def test_1_changesClearCaches():
+	boardTest = cachesFilled(Board(config=config1))
+	boardTest.shift(Move.LEFT)
+	assert cachesEmpty(boardTest)
+	cachesFilled(boardTest).placeTile(3, 3, 2)
+	assert cachesEmpty(boardTest)
+	cachesFilled(boardTest).placeRandomTile(1)
+	assert cachesEmpty(boardTest)
+	cachesFilled(boardTest).removeTile(3, 3)
+	assert cachesEmpty(boardTest)
+
+def test_2_cachesMatchRescan():
+	boardTest = Board(config=config4)
+	boardTest.shift(Move.DOWN)
+	boardTest.placeTile(0, 0, 4)
+	assert boardTest.emptySquares() == Board(config=boardTest.grid).emptySquares()
+	assert boardTest.validMoves() == Board(config=boardTest.grid).validMoves()
+	assert boardTest.maxTile() == Board(config=boardTest.grid).maxTile()
+
+def test_3_unmakeMoveRestoresCaches():
+	boardTest = cachesFilled(Board(config=config1))
+	caches = (boardTest.emptyCache, boardTest.movesCache, boardTest.maxCache)
+	Board.resetCacheStats()
+	undo = boardTest.makeMove(Move.LEFT)
+	boardTest.unmakeMove(undo)
+	assert (boardTest.emptyCache, boardTest.movesCache, boardTest.maxCache) == caches
+	assert boardTest.grid == config1
+	cachesFilled(boardTest)
+	assert Board.cacheStats() == {"emptySquares": {"scans": 0, "avoided": 1},
+								  "validMoves": {"scans": 0, "avoided": 1},
+								  "maxTile": {"scans": 0, "avoided": 1}}
+
+def test_4_resetCacheStatsOnInstance():
+	boardTest = cachesFilled(Board(config=config1))
+	boardTest.resetCacheStats()
+	assert all(stats == {"scans": 0, "avoided": 0} for stats in Board.cacheStats().values())
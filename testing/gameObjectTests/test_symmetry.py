@@ -0,0 +1,39 @@
+from allGameObjectTests import *
+from bitBoard import BitBoard
+from gameObjects import Move, transformGrid, transformMove, inverseTransformMove
+import pytest
+
+configs = [config1, config2, config3, config4, config5, config6,
+		   config7, config8, config9, config10, config11, config12]
+
+@pytest.mark.parametrize("config", configs)
+def test_canonicalKeyIsInvariant(config):
+	keys = set()
+	for transform in range(8):
+		grid = transformGrid(config, transform)
+		keys.add(Board(config=grid).canonicalKey()[0])
+		keys.add(BitBoard(config=grid).canonicalKey()[0])
+	assert len(keys) == 1
+
+@pytest.mark.parametrize("config", configs)
+def test_canonicalKeyTransform(config):
+	key, transform = Board(config=config).canonicalKey()
+	rows, cols = Board(config=transformGrid(config, transform)).packedLines()
+	assert tuple(rows) == key[0]
+
+def test_canonicalKeyLargeBoard():
+	config = [[2, 0, 0, 0, 0], [0, 4, 0, 0, 0], [0, 0, 0, 0, 8],
+			  [0, 0, 0, 0, 0], [16, 0, 0, 0, 0]]
+	key, transform = Board(size=5, config=config).canonicalKey()
+	assert key[0] == tuple(map(tuple, transformGrid(config, transform)))
+
+@pytest.mark.parametrize("config", configs)
+def test_transformMove(config):
+	for transform in range(8):
+		for move in Move:
+			boardTest = Board(config=config)
+			boardTest.shift(move)
+			transformedTest = Board(config=transformGrid(config, transform))
+			transformedTest.shift(transformMove(move, transform))
+			assert transformGrid(boardTest.grid, transform) == transformedTest.grid
+			assert inverseTransformMove(transformMove(move, transform), transform) == move
@@ -0,0 +1,40 @@
+import sys
+import pytest
+sys.path.insert(0, '../../2048-AI')
+from game import Game, runParallel, summarizeResults
+
+def trial(number, score, maxTile, moves, decisionTimes):
+	return {"trial": number, "score": score, "maxTile": maxTile, "moves": moves,
+			"totalDecisionTime": sum(decisionTimes), "meanDecisionTime": sum(decisionTimes) / moves,
+			"maxDecisionTime": max(decisionTimes)}
+
+def test_summarizeResults():
+	results = [trial(0, 1000, 128, 2, [0.1, 0.3]),
+			   trial(1, 3000, 256, 1, [0.2]),
+			   trial(2, 2000, 128, 1, [0.5])]
+	summary = summarizeResults(results)
+	assert summary["trials"] == 3
+	assert summary["meanScore"] == pytest.approx(2000)
+	assert summary["medianScore"] == pytest.approx(2000)
+	assert summary["maxScore"] == 3000
+	assert summary["maxTiles"] == {128: 2, 256: 1}
+	assert summary["moves"] == 4
+	assert summary["meanDecisionTime"] == pytest.approx(1.1 / 4)
+	assert summary["maxDecisionTime"] == pytest.approx(0.5)
+
+def test_summarizeNoResults():
+	summary = summarizeResults([])
+	assert summary["trials"] == 0 and summary["moves"] == 0
+
+def test_parallelMatchesSerial(tmp_path, monkeypatch):
+	# The logs are written to logs/ below the working directory
+	monkeypatch.chdir(tmp_path)
+	(tmp_path / "logs").mkdir()
+	serial = Game("RandomAgent", trials=3, progress=False, seed=11).run()
+	parallel = runParallel("RandomAgent", trials=3, processes=2, seed=11)
+	keys = ["trial", "score", "maxTile", "moves"]
+	assert [[result[key] for key in keys] for result in parallel] == \
+		   [[result[key] for key in keys] for result in serial]
+	assert [result["trial"] for result in parallel] == [0, 1, 2]
+	# One log for the serial run and one per shard
+	assert len(list((tmp_path / "logs").iterdir())) == 3
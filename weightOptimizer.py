@@ -12,7 +12,6 @@ from agents import *
 from qLearningAgents import *
 
 from logger import *
-from boardView import *
 
 import time
 import sys
@@ -43,7 +42,7 @@ class WeightOptimizer():
 		return neighbors
 
 	def run(self):
-		currentConfig = {"score": 1, "maxTile": 1, "numEmpty": 1, "corner": 1,
+		currentConfig = {"score": 1, "maxTile": 1, "numEmpty": 1, "maxTileCorner": 1,
 						 "tileDiff": 1, "logScore": 1, "monotonicity": 1}
 		currentScore = 0
 